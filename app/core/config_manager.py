@@ -6,7 +6,7 @@
 import json
 import os
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
 
 
 @dataclass
@@ -59,40 +59,47 @@ class WatermarkConfig:
     keep_aspect_ratio: bool = True
 
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典，并确保JSON兼容"""
-        data = asdict(self)
-        tuple_keys = {
-            "custom_position",
-            "text_color",
-            "shadow_offset",
-            "stroke_color",
-        }
-        for key in tuple_keys:
-            if key in data and isinstance(data[key], tuple):
-                data[key] = list(data[key])
+        """转换为字典，并确保JSON兼容
+
+        字段均为扁平的基础类型，逐字段浅拷贝即可，
+        无需asdict的递归深拷贝。
+        """
+        data = {}
+        for name in _FIELD_NAMES:
+            value = getattr(self, name)
+            if isinstance(value, (tuple, list)):
+                value = list(value)
+            data[name] = value
         return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'WatermarkConfig':
         """从字典创建配置对象，兼容旧配置文件"""
         config = cls()
-        tuple_fields = {
-            "custom_position",
-            "text_color",
-            "shadow_offset",
-            "stroke_color",
-        }
         for key, value in data.items():
             if hasattr(config, key):
-                if key in tuple_fields and isinstance(value, list):
+                if key in _TUPLE_FIELDS and isinstance(value, list):
                     value = tuple(value)
                 setattr(config, key, value)
         return config
 
 
+_FIELD_NAMES = tuple(f.name for f in fields(WatermarkConfig))
+# 以元组保存、写入JSON时转换为列表的字段
+_TUPLE_FIELDS = frozenset({
+    "custom_position",
+    "text_color",
+    "shadow_offset",
+    "stroke_color",
+})
+
+
 class ConfigManager:
     """配置管理器"""
     
+    # 调试用：以缩进格式写入配置与模板文件
+    PRETTY_JSON = False
+    
     def __init__(self, config_dir: str = None):
         """
         初始化配置管理器
@@ -113,25 +120,37 @@ class ConfigManager:
         
         # 当前配置
         self.current_config = WatermarkConfig()
+        self.recent_output_folder: Optional[str] = None
+        # 内存中的配置是否有尚未写入文件的修改
+        self._dirty = False
+        
+        # 模板缓存及其对应的文件修改时间
+        self._templates_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._templates_mtime: Optional[int] = None
         
         # 加载配置
         self.load_config()
     
     def save_config(self) -> bool:
         """
-        保存当前配置到文件
+        保存当前配置到文件，配置未修改时不写文件
         
         Returns:
             bool: 是否保存成功
         """
+        if not self._dirty:
+            return True
+        
         try:
             config_data = {
                 "version": "1.0",
                 "watermark": self.current_config.to_dict()
             }
+            if self.recent_output_folder:
+                config_data["recent_output_folder"] = self.recent_output_folder
             
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
+            self._write_json(self.config_file, config_data)
+            self._dirty = False
                 
             return True
             
@@ -139,6 +158,23 @@ class ConfigManager:
             print(f"保存配置失败: {e}")
             return False
     
+    def _write_json(self, path: str, data: Dict[str, Any]) -> None:
+        """
+        原子地写入JSON文件
+        
+        先完整写入临时文件再用os.replace替换，中途崩溃不会留下半截文件。
+        默认输出紧凑格式，PRETTY_JSON为True时输出便于阅读的缩进格式。
+        """
+        if self.PRETTY_JSON:
+            payload = json.dumps(data, indent=2, ensure_ascii=False)
+        else:
+            payload = json.dumps(data, separators=(',', ':'))
+        
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload.encode('utf-8'))
+        os.replace(tmp_path, path)
+    
     def load_config(self) -> bool:
         """
         从文件加载配置
@@ -148,14 +184,18 @@ class ConfigManager:
         """
         try:
             if not os.path.exists(self.config_file):
-                # 使用默认配置
-                return self.save_config()
+                # 使用默认配置，默认值无需写入文件
+                self.current_config = WatermarkConfig()
+                self._dirty = False
+                return True
             
             with open(self.config_file, 'r', encoding='utf-8') as f:
                 config_data = json.load(f)
             
             if "watermark" in config_data:
                 self.current_config = WatermarkConfig.from_dict(config_data["watermark"])
+            self.recent_output_folder = config_data.get("recent_output_folder")
+            self._dirty = False
             
             return True
             
@@ -163,12 +203,24 @@ class ConfigManager:
             print(f"加载配置失败: {e}")
             # 使用默认配置
             self.current_config = WatermarkConfig()
+            self._dirty = False
             return False
     
     def get_config(self) -> WatermarkConfig:
         """获取当前配置"""
         return self.current_config
     
+    def set_config(self, config: WatermarkConfig) -> None:
+        """
+        替换当前配置，仅在内容变化时标记为需要保存
+        
+        Args:
+            config: 新的配置
+        """
+        if config != self.current_config:
+            self._dirty = True
+        self.current_config = config
+    
     def update_config(self, **kwargs) -> None:
         """
         更新配置
@@ -179,6 +231,7 @@ class ConfigManager:
         for key, value in kwargs.items():
             if hasattr(self.current_config, key):
                 setattr(self.current_config, key, value)
+                self._dirty = True
     
     def save_template(self, name: str, config: WatermarkConfig = None) -> bool:
         """
@@ -202,8 +255,7 @@ class ConfigManager:
             templates[name] = config.to_dict()
             
             # 保存模板文件
-            with open(self.templates_file, 'w', encoding='utf-8') as f:
-                json.dump(templates, f, indent=2, ensure_ascii=False)
+            self._write_templates(templates)
                 
             return True
             
@@ -218,21 +270,41 @@ class ConfigManager:
         Returns:
             Dict: 模板字典 {name: config_dict}
         """
+        return dict(self._get_templates())
+    
+    def _get_templates(self) -> Dict[str, Dict[str, Any]]:
+        """返回缓存的模板字典，仅在模板文件变化后重新读取"""
         try:
-            if not os.path.exists(self.templates_file):
-                return {}
-            
-            with open(self.templates_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-                
-        except Exception as e:
-            print(f"加载模板失败: {e}")
-            return {}
+            mtime = os.stat(self.templates_file).st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        if self._templates_cache is not None and mtime == self._templates_mtime:
+            return self._templates_cache
+        
+        templates: Dict[str, Dict[str, Any]] = {}
+        if mtime is not None:
+            try:
+                with open(self.templates_file, 'r', encoding='utf-8') as f:
+                    templates = json.load(f)
+            except Exception as e:
+                print(f"加载模板失败: {e}")
+                templates = {}
+        
+        self._templates_cache = templates
+        self._templates_mtime = mtime
+        return templates
+    
+    def _write_templates(self, templates: Dict[str, Dict[str, Any]]) -> None:
+        """写入模板文件并同步缓存"""
+        self._templates_cache = None
+        self._write_json(self.templates_file, templates)
+        self._templates_cache = templates
+        self._templates_mtime = os.stat(self.templates_file).st_mtime_ns
     
     def get_template_names(self) -> List[str]:
         """获取所有模板名称"""
-        templates = self.load_templates()
-        return list(templates.keys())
+        return list(self._get_templates().keys())
     
     def load_template(self, name: str) -> bool:
         """
@@ -245,11 +317,12 @@ class ConfigManager:
             bool: 是否加载成功
         """
         try:
-            templates = self.load_templates()
+            templates = self._get_templates()
             if name not in templates:
                 return False
             
             self.current_config = WatermarkConfig.from_dict(templates[name])
+            self._dirty = True
             return True
             
         except Exception as e:
@@ -274,8 +347,7 @@ class ConfigManager:
             del templates[name]
             
             # 保存更新后的模板文件
-            with open(self.templates_file, 'w', encoding='utf-8') as f:
-                json.dump(templates, f, indent=2, ensure_ascii=False)
+            self._write_templates(templates)
                 
             return True
             
@@ -286,43 +358,27 @@ class ConfigManager:
     def reset_to_default(self) -> None:
         """重置为默认配置"""
         self.current_config = WatermarkConfig()
+        self._dirty = True
     
     def get_recent_output_folder(self) -> Optional[str]:
-        """获取最近使用的输出文件夹"""
-        try:
-            if not os.path.exists(self.config_file):
-                return None
-                
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-                
-            return config_data.get("recent_output_folder")
-            
-        except Exception:
-            return None
+        """获取最近使用的输出文件夹（内存中的值，随load_config读取）"""
+        return self.recent_output_folder
     
     def save_recent_output_folder(self, folder_path: str) -> bool:
         """
-        保存最近使用的输出文件夹
+        记录最近使用的输出文件夹
+        
+        仅更新内存中的值，随下一次save_config一并写入配置文件，
+        避免每次选择文件夹都重写整个配置文件。
         
         Args:
             folder_path: 文件夹路径
             
         Returns:
-            bool: 是否保存成功
+            bool: 是否记录成功
         """
-        try:
-            config_data = {
-                "version": "1.0",
-                "watermark": self.current_config.to_dict(),
-                "recent_output_folder": folder_path
-            }
-            
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
-                
-            return True
-            
-        except Exception as e:
-            print(f"保存输出文件夹失败: {e}")
-            return False
+        folder_path = folder_path or None
+        if folder_path != self.recent_output_folder:
+            self.recent_output_folder = folder_path
+            self._dirty = True
+        return True
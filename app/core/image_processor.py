@@ -5,16 +5,29 @@
 
 import os
 import sys
+import hashlib
+import json
 import math
-from dataclasses import dataclass
-from typing import Tuple, Optional, Union, Dict, TYPE_CHECKING, List
-from collections import defaultdict
+import re
+import struct
+import threading
+import weakref
+from array import array
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Tuple, Optional, Union, Dict, TYPE_CHECKING, List, Callable, Set
+from collections import defaultdict, OrderedDict
 from PIL import Image, ImageDraw, ImageFont
 
 if TYPE_CHECKING:
+    from PyQt5.QtGui import QPixmap
     from .config_manager import WatermarkConfig
-from PyQt5.QtCore import QSize
-from PyQt5.QtGui import QPixmap, QImage
+
+
+_BOLD_STYLE_TOKENS = ("bold", "black", "heavy", "demi", "semi", "semibold", "medium")
+_ITALIC_STYLE_TOKENS = ("italic", "oblique", "slant", "slanted")
 
 
 @dataclass(frozen=True)
@@ -22,53 +35,164 @@ class FontEntry:
     path: str
     style: str
     index: int = 0
+    # 由style派生，创建时计算一次，供字体评分使用
+    style_lower: str = field(init=False, repr=False, compare=False)
+    has_bold: bool = field(init=False, repr=False, compare=False)
+    has_italic: bool = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        style_lower = (self.style or "").lower()
+        object.__setattr__(self, "style_lower", style_lower)
+        object.__setattr__(self, "has_bold", any(token in style_lower for token in _BOLD_STYLE_TOKENS))
+        object.__setattr__(self, "has_italic", any(token in style_lower for token in _ITALIC_STYLE_TOKENS))
+
+
+# 缩略图缓存键: (文件路径, 修改时间ns, 尺寸, 重采样滤镜)
+ThumbnailKey = Tuple[str, int, Tuple[int, int], int]
+
+
+def _as_tuple(value) -> tuple:
+    """配置中的颜色、偏移通常已是元组（from_dict已转换），仅在是列表时才新建元组"""
+    return value if isinstance(value, tuple) else tuple(value)
+
+
+# 直角的精确三角函数值，math.cos(math.radians(90))等会带有浮点误差
+_RIGHT_ANGLE_TRIG = {0: (1.0, 0.0), 90: (0.0, 1.0), 180: (-1.0, 0.0), 270: (0.0, -1.0)}
+# 直角旋转（逆时针）对应的无插值像素转置
+_RIGHT_ANGLE_TRANSPOSE = {
+    90: Image.Transpose.ROTATE_90,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_270,
+}
+
+
+@lru_cache(maxsize=360)
+def _rotation_trig(rotation: float) -> Tuple[float, float]:
+    """返回旋转角度（度）对应的(cos, sin)，按角度缓存"""
+    if rotation % 90 == 0:
+        return _RIGHT_ANGLE_TRIG[int(rotation % 360)]
+    theta = math.radians(rotation)
+    return math.cos(theta), math.sin(theta)
+
+
+_IDENTITY_RGB_LUT = tuple(range(256)) * 3
+
+
+@lru_cache(maxsize=256)
+def _opacity_lut(opacity: int) -> Tuple[int, ...]:
+    """返回RGBA图像的1024项查找表：RGB保持不变，alpha按opacity/255缩放；按不透明度缓存"""
+    return _IDENTITY_RGB_LUT + tuple((value * opacity + 127) // 255 for value in range(256))
+
+
+@dataclass(frozen=True)
+class ImageMeta:
+    size: Tuple[int, int]
+    mode: str
+    mtime_ns: int
+
+
+# 匹配非字母数字字符（与str.isalnum互补，保留中文等Unicode字母）
+_NON_ALNUM_RE = re.compile(r'[\W_]+')
+
+
+def _normalize_family(name: str) -> str:
+    """字体族名归一化：小写并去掉空格、连字符等非字母数字字符"""
+    if not name:
+        return ""
+    return _NON_ALNUM_RE.sub("", name.lower())
+
+
+_FLAG_BOLD = 1
+_FLAG_ITALIC = 2
+
+
+class _FamilyArrays:
+    """同一字体族的候选字体，按列存储（路径、小写样式名、TTC索引、粗/斜体标志位）"""
+    __slots__ = ("paths", "styles_lower", "indices", "flags")
 
-class FontResolver:
     def __init__(self):
-        self._fonts_by_family: Dict[str, list[FontEntry]] = defaultdict(list)
-        self._cache: Dict[Tuple[str, bool, bool, str], Optional[Tuple[str, int]]] = {}
+        self.paths: list[str] = []
+        self.styles_lower: list[str] = []
+        self.indices = array('H')
+        self.flags = array('B')
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def append(self, entry: FontEntry) -> None:
+        self.add(entry.path, entry.style_lower, entry.index,
+                 (_FLAG_BOLD if entry.has_bold else 0) | (_FLAG_ITALIC if entry.has_italic else 0))
+
+    def add(self, path: str, style_lower: str, index: int, flags: int) -> None:
+        self.paths.append(path)
+        self.styles_lower.append(style_lower)
+        self.indices.append(index)
+        self.flags.append(flags)
+
+    def to_json(self) -> list:
+        return [self.paths, self.styles_lower, self.indices.tolist(), self.flags.tolist()]
+
+    @classmethod
+    def from_json(cls, data: list) -> "_FamilyArrays":
+        family = cls()
+        family.paths, family.styles_lower = list(data[0]), list(data[1])
+        family.indices = array('H', data[2])
+        family.flags = array('B', data[3])
+        return family
+
+
+class FontResolver:
+    # 解析结果缓存的最大条目数
+    RESOLVE_CACHE_SIZE = 512
+    # 磁盘索引缓存的格式版本，格式变化时旧缓存自动失效
+    INDEX_CACHE_VERSION = 2
+    FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+    # 遍历字体目录时跳过的子目录（另外跳过所有以.开头的隐藏目录）
+    SKIPPED_FONT_DIRS = frozenset({"__pycache__", "fonts-config"})
+    # TTC文件头中字体数量的上限，防止损坏或伪造的文件头导致近乎无限的循环
+    MAX_COLLECTION_FACES = 256
+
+    def __init__(self, index_cache_path: Optional[str] = None):
+        self._fonts_by_family: Dict[str, _FamilyArrays] = defaultdict(_FamilyArrays)
+        # 按实例包装，缓存随解析器释放且不会持有其他实例
+        self._resolve_cached = lru_cache(maxsize=self.RESOLVE_CACHE_SIZE)(self._resolve_uncached)
         self._indexed = False
+        # 字体索引的磁盘缓存，字体目录未变化时跳过扫描与解析
+        self._index_cache_path = index_cache_path
 
     def resolve(self, family: str, bold: bool, italic: bool, style_name: str = "") -> Optional[Tuple[str, int]]:
         if not family:
             return None
         target_style = (style_name or "").lower().strip()
-        key = (family.lower(), bool(bold), bool(italic), target_style)
-        if key in self._cache:
-            return self._cache[key]
+        return self._resolve_cached(family.lower(), bool(bold), bool(italic), target_style)
 
+    def _resolve_uncached(self, family_lower: str, bold: bool, italic: bool,
+                          target_style: str) -> Optional[Tuple[str, int]]:
         self._ensure_index()
-        entries = self._fonts_by_family.get(family.lower())
-        if not entries:
-            normalized = self._normalize_family(family)
+        family = self._fonts_by_family.get(family_lower)
+        if not family:
+            normalized = self._normalize_family(family_lower)
             if normalized:
-                entries = self._fonts_by_family.get(normalized)
-        if not entries:
-            self._cache[key] = None
+                family = self._fonts_by_family.get(normalized)
+        if not family:
             return None
 
-        best_entry = None
+        best = 0
         best_score = -1
+        score_style = self._score_style
 
-        for entry in entries:
-            score = self._score_entry(entry.style, bold, italic)
-            style_lower = (entry.style or "").lower()
+        for i, (style_lower, flags) in enumerate(zip(family.styles_lower, family.flags)):
+            score = score_style(style_lower, flags & _FLAG_BOLD != 0, flags & _FLAG_ITALIC != 0, bold, italic)
             if target_style:
                 if style_lower == target_style:
                     score += 5
                 elif target_style in style_lower:
                     score += 3
             if score > best_score:
-                best_entry = entry
+                best = i
                 best_score = score
 
-        if best_entry is None:
-            best_entry = entries[0]
-
-        result = (best_entry.path, best_entry.index)
-        self._cache[key] = result
-        return result
+        return (family.paths[best], family.indices[best])
 
     def _font_directories(self) -> list[str]:
         dirs: list[str] = []
@@ -95,23 +219,88 @@ class FontResolver:
         if self._indexed:
             return
 
+        directories, font_files = self._walk_font_files(self._font_directories())
+        signature = self._index_signature(directories)
+        if self._load_index_cache(signature):
+            self._indexed = True
+            return
+
         seen_entries = set()
-        for directory in self._font_directories():
-            try:
-                for entry in os.scandir(directory):
-                    if not entry.is_file():
-                        continue
-                    lower = entry.name.lower()
-                    if not lower.endswith((".ttf", ".otf", ".ttc")):
-                        continue
-                    path = entry.path
-                    if lower.endswith(".ttc"):
-                        self._index_collection(path, seen_entries)
-                    else:
-                        self._index_font_file(path, 0, seen_entries)
-            except PermissionError:
-                continue
+        for path in font_files:
+            if path.lower().endswith(".ttc"):
+                self._index_collection(path, seen_entries)
+            else:
+                self._index_font_file(path, 0, seen_entries)
         self._indexed = True
+        self._save_index_cache(signature)
+
+    def _walk_font_files(self, roots: list[str]) -> Tuple[list[str], list[str]]:
+        """
+        递归遍历字体目录（如Linux下的/usr/share/fonts/truetype/*）
+        
+        只按扩展名筛选文件名，不对文件逐个stat；无权限的目录由os.walk静默跳过。
+        
+        Returns:
+            (遍历到的目录列表, 字体文件路径列表)
+        """
+        directories: list[str] = []
+        font_files: list[str] = []
+        for root in roots:
+            for current, dirnames, filenames in os.walk(root):
+                dirnames[:] = [name for name in dirnames
+                               if not name.startswith(".") and name not in self.SKIPPED_FONT_DIRS]
+                directories.append(current)
+                for name in filenames:
+                    if name.lower().endswith(self.FONT_EXTENSIONS):
+                        font_files.append(os.path.join(current, name))
+        return directories, font_files
+
+    @staticmethod
+    def _index_signature(directories: list[str]) -> list:
+        """索引缓存的有效性标识：平台及各级字体目录的修改时间"""
+        signature: list = [FontResolver.INDEX_CACHE_VERSION, sys.platform]
+        for directory in directories:
+            try:
+                signature.append([directory, os.stat(directory).st_mtime_ns])
+            except OSError:
+                signature.append([directory, None])
+        return signature
+
+    def _load_index_cache(self, signature: list) -> bool:
+        if not self._index_cache_path or not os.path.isfile(self._index_cache_path):
+            return False
+        try:
+            with open(self._index_cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("signature") != signature:
+                return False
+            fonts_by_family: Dict[str, _FamilyArrays] = defaultdict(_FamilyArrays)
+            for family, columns in data.get("families", {}).items():
+                fonts_by_family[family] = _FamilyArrays.from_json(columns)
+        except Exception as e:
+            print(f"读取字体索引缓存失败: {e}")
+            return False
+        self._fonts_by_family = fonts_by_family
+        return True
+
+    def _save_index_cache(self, signature: list) -> None:
+        if not self._index_cache_path:
+            return
+        data = {
+            "signature": signature,
+            "families": {
+                family: columns.to_json()
+                for family, columns in self._fonts_by_family.items()
+            }
+        }
+        tmp_path = self._index_cache_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self._index_cache_path) or ".", exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self._index_cache_path)
+        except Exception as e:
+            print(f"保存字体索引缓存失败: {e}")
 
     def _store_entry(self, family: str, entry: FontEntry) -> None:
         key = family.lower()
@@ -120,48 +309,45 @@ class FontResolver:
         if normalized and normalized != key:
             self._fonts_by_family[normalized].append(entry)
 
-    @staticmethod
-    def _normalize_family(name: str) -> str:
-        if not name:
-            return ""
-        return "".join(ch for ch in name.lower() if ch.isalnum())
+    _normalize_family = staticmethod(_normalize_family)
 
     def _index_collection(self, path: str, seen_entries: set[Tuple[str, int]]) -> None:
-        for index in range(10):
-            if (path, index) in seen_entries:
-                continue
-            try:
-                font = ImageFont.truetype(path, size=32, index=index)
-            except OSError:
+        for index in range(self._collection_face_count(path)):
+            # 某个索引无法打开时，其后的索引通常同样无效，直接停止
+            if self._index_font_file(path, index, seen_entries) is False:
                 break
-            family, style = font.getname()
-            if family:
-                entry = FontEntry(path=path, style=style or "", index=index)
-                self._store_entry(family, entry)
-                seen_entries.add((path, index))
 
-    def _index_font_file(self, path: str, index: int, seen_entries: set[Tuple[str, int]]) -> None:
+    @staticmethod
+    def _collection_face_count(path: str) -> int:
+        """从TTC文件头读取字体数量（'ttcf'标记后偏移8处的大端uint32），无法识别时按单个字体处理"""
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(12)
+        except OSError:
+            return 0
+        if len(header) < 12 or header[:4] != b'ttcf':
+            return 1
+        count = struct.unpack('>I', header[8:12])[0]
+        return min(count, FontResolver.MAX_COLLECTION_FACES)
+
+    def _index_font_file(self, path: str, index: int, seen_entries: set[Tuple[str, int]]) -> bool:
+        """索引单个字体，字体文件无法打开时返回False"""
         if (path, index) in seen_entries:
-            return
+            return True
         try:
             font = ImageFont.truetype(path, size=32, index=index)
         except OSError:
-            return
+            return False
         family, style = font.getname()
         if family:
             entry = FontEntry(path=path, style=style or "", index=index)
             self._store_entry(family, entry)
             seen_entries.add((path, index))
+        return True
 
     @staticmethod
-    def _score_entry(style: str, bold: bool, italic: bool) -> int:
-        style_lower = (style or "").lower()
-        bold_tokens = ("bold", "black", "heavy", "demi", "semi", "semibold", "medium")
-        italic_tokens = ("italic", "oblique", "slant", "slanted")
-
-        has_bold = any(token in style_lower for token in bold_tokens)
-        has_italic = any(token in style_lower for token in italic_tokens)
-
+    def _score_style(style_lower: str, has_bold: bool, has_italic: bool,
+                     bold: bool, italic: bool) -> int:
         score = 0
         if bold == has_bold:
             score += 2
@@ -182,156 +368,220 @@ class ImageProcessor:
     # 支持的图像格式
     SUPPORTED_INPUT_FORMATS = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif')
     SUPPORTED_OUTPUT_FORMATS = ['JPEG', 'PNG']
+    # 九宫格位置 -> (列, 行)
+    GRID_POSITIONS = {
+        'top-left': (0, 0),
+        'top-center': (1, 0),
+        'top-right': (2, 0),
+        'middle-left': (0, 1),
+        'center': (1, 1),
+        'middle-right': (2, 1),
+        'bottom-left': (0, 2),
+        'bottom-center': (1, 2),
+        'bottom-right': (2, 2)
+    }
+    # 导出编码参数：PNG使用低压缩级别换取数倍的写入速度（文件约大一成），
+    # JPEG显式关闭耗时的优化与渐进式编码
+    PNG_SAVE_OPTIONS = {'compress_level': 1, 'optimize': False}
+    JPEG_SAVE_OPTIONS = {'optimize': False, 'progressive': False, 'subsampling': 2}
+    # 实时预览缩放使用的重采样滤镜，导出仍使用LANCZOS
+    PREVIEW_RESAMPLE = Image.Resampling.BILINEAR
+    # 同时保留在内存中的已解码图像数量
+    MAX_DECODED_IMAGES = 4
+    # 探测文件头以I/O等待为主，线程数可多于CPU核数
+    PROBE_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+    # 并行导出的最大线程数；每个线程同时持有一张解码后的整图，过多会放大内存占用
+    EXPORT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+    # 自动选择进程数时，少于该数量的批量任务直接在当前进程处理，启动spawn进程的开销得不偿失
+    BATCH_MIN_PROCESS_JOBS = 8
+    # 文本包围盒缓存的最大条目数
+    MAX_TEXT_BBOX_CACHE = 512
+    MAX_THUMBNAIL_CACHE = 512
+    MAX_TEXT_LAYER_CACHE = 16
+    MAX_OVERLAY_CACHE = 16
+    # 水印文件状态的缓存有效期（秒），批量处理时避免逐张stat
+    WATERMARK_STAT_TTL = 1.0
+    MAX_PATH_STAT_CACHE = 64
+    # 已读取的水印图片为整幅RGBA图像，只保留少量
+    MAX_WATERMARK_CACHE = 4
+    # 磁盘缩略图缓存的容量上限（字节），启动时按修改时间删除最旧的文件
+    MAX_THUMBNAIL_DISK_BYTES = 64 * 1024 * 1024
+    MAX_TRUETYPE_CACHE = 64
+    # 缩小比例超过该倍数时，先用NEAREST粗缩再用目标滤镜精缩
+    THUMBNAIL_PREREDUCE_FACTOR = 4
     
-    def __init__(self):
-        """初始化图像处理器"""
-        self.images = {}  # 存储加载的图像 {file_path: PIL.Image}
+    def __init__(self, thumbnail_cache_dir: Optional[str] = None,
+                 font_index_cache: Optional[str] = None):
+        """
+        初始化图像处理器
+        
+        Args:
+            thumbnail_cache_dir: 磁盘缩略图缓存目录，为None时只使用内存缓存
+            font_index_cache: 系统字体索引的缓存文件路径，为None时每次启动重新扫描
+        """
+        self.images: Dict[str, ImageMeta] = {}  # 已加载图像的索引 {file_path: ImageMeta}，像素按需解码
         self.current_image_path = None
-        self._watermark_cache: Dict[str, Image.Image] = {}
-        self._font_resolver = FontResolver()
+        # 已加载图像所在的文件夹，按需计算，移除图像时失效
+        self._image_dirs: Optional[Set[str]] = None
+        self._decoded_cache: "OrderedDict[str, Image.Image]" = OrderedDict()
+        # 被LRU淘汰但仍被其他对象（如导出线程）引用的解码图像，可直接找回而无需重新解码
+        self._decoded_refs: "weakref.WeakValueDictionary[str, Image.Image]" = weakref.WeakValueDictionary()
+        self._decoded_lock = threading.Lock()
+        self._watermark_cache: "OrderedDict[str, Tuple[int, Image.Image]]" = OrderedDict()  # {路径: (修改时间ns, RGBA图像)}
+        self._path_stat_cache: "OrderedDict[str, Tuple[float, Optional[int]]]" = OrderedDict()  # {路径: (检查时刻, 修改时间ns)}
+        self._watermark_lock = threading.Lock()
+        # FreeTypeFont不保证线程安全，字体对象按线程分别缓存（导出线程与预览互不共享）
+        self._font_local = threading.local()
+        self._font_name_cache: Dict[Tuple[str, int], Tuple[str, str]] = {}
+        self._measure_cache: Dict[tuple, Tuple[int, int]] = {}
+        self._text_bbox_cache: Dict[Tuple[ImageFont.FreeTypeFont, str, int], Tuple[Tuple[int, int, int, int], int]] = {}
+        # 多行文本测量用的绘图对象，仅用于只读的textbbox
+        self._dummy_draw = ImageDraw.Draw(Image.new('RGBA', (1, 1), (0, 0, 0, 0)))
+        self._text_layer_cache: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+        self._text_layer_lock = threading.Lock()
+        # 已旋转的文字层与处理好的图片水印，批量处理时所有图片共用
+        self._overlay_cache: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+        self._overlay_lock = threading.Lock()
+        self._font_resolver = FontResolver(font_index_cache)
+        self._thumb_cache: "OrderedDict[ThumbnailKey, QPixmap]" = OrderedDict()
+        self._thumbnail_cache_dir = thumbnail_cache_dir
+        if thumbnail_cache_dir:
+            self._prune_thumbnail_disk_cache()
 
     def apply_watermark(self, image: Image.Image, config: "WatermarkConfig") -> Image.Image:
-        working = image.copy()
-        original_width, original_height = working.size
+        # 不预先复制整图：缩放本身会产生新图像，未缩放时推迟到真正原地绘制前再复制
+        working = image
 
-        if getattr(config, "resize_enabled", False):
+        if config.resize_enabled:
             resized = self.resize_image(
                 working,
-                getattr(config, "resize_method", "percentage"),
-                getattr(config, "resize_width", original_width),
-                getattr(config, "resize_height", original_height),
-                getattr(config, "resize_percentage", 100),
-                getattr(config, "keep_aspect_ratio", True)
+                config.resize_method,
+                config.resize_width,
+                config.resize_height,
+                config.resize_percentage,
+                config.keep_aspect_ratio
             )
             if resized:
                 working = resized
 
         image_size = working.size
-        watermark_type = getattr(config, "watermark_type", "text")
-
-        if watermark_type == "image":
-            watermark_path = getattr(config, "image_watermark_path", "")
-            wm_size = self._get_image_watermark_size(
-                watermark_path,
-                getattr(config, "image_scale", 1.0),
-                getattr(config, "rotation_angle", 0)
-            )
+        rotation = config.rotation_angle
+        use_custom_position = config.use_custom_position and config.custom_position
 
-            if getattr(config, "use_custom_position", False) and getattr(config, "custom_position", None):
-                position = self._clamp_position(
-                    config.custom_position,
-                    image_size,
-                    wm_size
-                )
+        if config.watermark_type == "image":
+            watermark_path = config.image_watermark_path
+            image_scale = config.image_scale
+            wm_size = self._get_image_watermark_size(watermark_path, image_scale, rotation)
+
+            if use_custom_position:
+                position = self._clamp_position(config.custom_position, image_size, wm_size)
             else:
-                position = self._calculate_grid_position(
-                    image_size,
-                    wm_size,
-                    getattr(config, "position_type", "bottom-right")
-                )
+                position = self._calculate_grid_position(image_size, wm_size, config.position_type)
 
-            if watermark_path and os.path.exists(watermark_path):
+            if self._path_exists(watermark_path):
                 return self.add_image_watermark(
                     working,
                     watermark_path,
                     position,
-                    getattr(config, "image_scale", 1.0),
-                    getattr(config, "image_opacity", 128),
-                    getattr(config, "rotation_angle", 0)
+                    image_scale,
+                    config.image_opacity,
+                    rotation,
+                    copy_first=working is image
                 )
-            return working
+            return working if working is not image else image.copy()
 
-        text = getattr(config, "text", "")
+        text = config.text
         if not text:
-            return working
+            return working if working is not image else image.copy()
 
-        font_path = getattr(config, "font_path", "")
-        font_index = getattr(config, "font_index", 0)
-        if not font_path:
-            families: list[str] = []
-            primary_family = getattr(config, "font_family", "")
-            if primary_family:
-                families.append(primary_family)
-            aliases = getattr(config, "font_family_aliases", []) or []
-            for alias in aliases:
-                if alias and alias not in families:
-                    families.append(alias)
-            resolved_family, resolved = self.resolve_font_with_aliases(
-                families or ["Arial"],
-                getattr(config, "font_bold", True),
-                getattr(config, "font_italic", False),
-                getattr(config, "font_style_name", "")
-            )
-            if resolved:
-                font_path, font_index = resolved
-                if hasattr(config, "font_family") and resolved_family:
-                    setattr(config, "font_family", resolved_family)
-                if hasattr(config, "font_path"):
-                    setattr(config, "font_path", font_path)
-                if hasattr(config, "font_index"):
-                    setattr(config, "font_index", font_index)
+        bold = config.font_bold
+        italic = config.font_italic
+        style_name = config.font_style_name
+        font_path, font_index = self._resolve_config_font(config)
+
+        font_family = config.font_family
+        font_size = config.font_size
+        shadow = config.text_shadow
+        stroke = config.text_stroke
+        stroke_width = config.stroke_width
+        shadow_offset = _as_tuple(config.shadow_offset)
 
         wm_size = self._measure_text(
             text,
-            getattr(config, "font_family", "Arial"),
-            getattr(config, "font_size", 36),
-            getattr(config, "font_bold", True),
-            getattr(config, "font_italic", False),
-            getattr(config, "text_stroke", False),
-            getattr(config, "stroke_width", 0),
-            getattr(config, "text_shadow", False),
-            tuple(getattr(config, "shadow_offset", (0, 0))),
-            getattr(config, "rotation_angle", 0),
+            font_family,
+            font_size,
+            bold,
+            italic,
+            stroke,
+            stroke_width,
+            shadow,
+            shadow_offset,
+            rotation,
             font_path,
             font_index,
-            getattr(config, "font_style_name", "")
+            style_name
         )
 
-        if getattr(config, "use_custom_position", False) and getattr(config, "custom_position", None):
-            position = self._clamp_position(
-                config.custom_position,
-                image_size,
-                wm_size
-            )
+        if use_custom_position:
+            position = self._clamp_position(config.custom_position, image_size, wm_size)
         else:
-            position = self._calculate_grid_position(
-                image_size,
-                wm_size,
-                getattr(config, "position_type", "bottom-right")
-            )
-
-        text_color = tuple(getattr(config, "text_color", (255, 255, 255)))
-        stroke_color = tuple(getattr(config, "stroke_color", (0, 0, 0)))
-        shadow_offset = tuple(getattr(config, "shadow_offset", (0, 0)))
+            position = self._calculate_grid_position(image_size, wm_size, config.position_type)
 
         return self.add_text_watermark(
             working,
             text,
             position,
-            getattr(config, "opacity", 128),
-            getattr(config, "font_size", 36),
-            getattr(config, "font_family", "Arial"),
-            getattr(config, "font_bold", True),
-            getattr(config, "font_italic", False),
-            text_color,
-            getattr(config, "text_shadow", False),
-            getattr(config, "text_stroke", False),
-            getattr(config, "rotation_angle", 0),
+            config.opacity,
+            font_size,
+            font_family,
+            bold,
+            italic,
+            _as_tuple(config.text_color),
+            shadow,
+            stroke,
+            rotation,
             shadow_offset,
-            getattr(config, "stroke_width", 0),
-            stroke_color,
+            stroke_width,
+            _as_tuple(config.stroke_color),
             font_path,
             font_index,
-            getattr(config, "font_style_name", "")
+            style_name,
+            copy_first=working is image
         )
 
+    def _resolve_config_font(self, config: "WatermarkConfig") -> Tuple[str, int]:
+        """
+        确定配置使用的字体文件，未指定路径时按字体族及别名解析
+        
+        解析结果写回config（font_family/font_path/font_index），后续使用同一配置时无需再解析。
+        """
+        if not config.font_path:
+            families: list[str] = []
+            if config.font_family:
+                families.append(config.font_family)
+            for alias in config.font_family_aliases or []:
+                if alias and alias not in families:
+                    families.append(alias)
+            resolved_family, resolved = self.resolve_font_with_aliases(
+                families or ["Arial"],
+                config.font_bold,
+                config.font_italic,
+                config.font_style_name
+            )
+            if resolved:
+                if resolved_family:
+                    config.font_family = resolved_family
+                config.font_path, config.font_index = resolved
+        return config.font_path, config.font_index
+
     @staticmethod
     def _rotated_bounds(width: int, height: int, rotation: int) -> Tuple[int, int]:
-        if rotation % 360 == 0:
-            return width, height
-        theta = math.radians(rotation)
-        cos_t = abs(math.cos(theta))
-        sin_t = abs(math.sin(theta))
+        if rotation % 90 == 0:
+            # 直角旋转只交换宽高，与Image.rotate(expand=True)的结果一致
+            return (height, width) if rotation % 180 else (width, height)
+        cos_t, sin_t = _rotation_trig(rotation)
+        cos_t = abs(cos_t)
+        sin_t = abs(sin_t)
         rotated_width = width * cos_t + height * sin_t
         rotated_height = width * sin_t + height * cos_t
         return int(math.ceil(rotated_width)), int(math.ceil(rotated_height))
@@ -345,41 +595,35 @@ class ImageProcessor:
         if not text:
             return 0, 0
 
+        # 批量处理时每张图片的测量参数相同，整体结果按参数缓存
+        key = (text, font_family, font_size, bool(bold), bool(italic), bool(stroke), stroke_width,
+               bool(shadow), tuple(shadow_offset) if shadow else None, rotation,
+               font_path or "", font_index, style_name or "")
+        cached = self._measure_cache.get(key)
+        if cached is not None:
+            return cached
+        size = self._measure_text_uncached(text, font_family, font_size, bold, italic, stroke,
+                                           stroke_width, shadow, shadow_offset, rotation,
+                                           font_path, font_index, style_name)
+        if len(self._measure_cache) >= self.MAX_TEXT_BBOX_CACHE:
+            self._measure_cache.clear()
+        self._measure_cache[key] = size
+        return size
+
+    def _measure_text_uncached(self, text: str, font_family: str, font_size: int,
+                               bold: bool, italic: bool, stroke: bool,
+                               stroke_width: int, shadow: bool,
+                               shadow_offset: Tuple[int, int], rotation: int,
+                               font_path: Optional[str], font_index: int,
+                               style_name: str) -> Tuple[int, int]:
         font = self._load_font(font_family, font_size, bold, italic, font_path, font_index, style_name)
-        dummy = Image.new('RGBA', (1, 1), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(dummy)
-
-        bbox = None
-        stroke_padding = 0
-        if stroke and stroke_width > 0:
-            try:
-                bbox = draw.textbbox(
-                    (0, 0),
-                    text,
-                    font=font,
-                    stroke_width=stroke_width,
-                    stroke_fill=(0, 0, 0, 255)
-                )
-            except TypeError:
-                try:
-                    bbox = draw.textbbox(
-                        (0, 0),
-                        text,
-                        font=font,
-                        stroke_width=stroke_width
-                    )
-                    stroke_padding = stroke_width * 2
-                except TypeError:
-                    stroke_padding = stroke_width * 2
-        if bbox is None:
-            try:
-                bbox = draw.textbbox((0, 0), text, font=font)
-            except AttributeError:
-                size = draw.textsize(text, font=font)
-                bbox = (0, 0, size[0], size[1])
+        bbox, stroke_padding = self._text_bbox(font, text, stroke_width if stroke else 0)
 
         text_width = bbox[2] - bbox[0] + stroke_padding
         text_height = bbox[3] - bbox[1] + stroke_padding
+        if not shadow and rotation % 360 == 0:
+            # 常见的无阴影、无旋转文字：包围盒即为结果
+            return text_width, text_height
 
         offset_x, offset_y = shadow_offset if shadow else (0, 0)
         extra_left = max(0, -offset_x)
@@ -392,23 +636,100 @@ class ImageProcessor:
 
         return self._rotated_bounds(canvas_width, canvas_height, rotation)
 
+    def _text_bbox(self, font: ImageFont.FreeTypeFont, text: str,
+                   stroke_width: int) -> Tuple[Tuple[int, int, int, int], int]:
+        """
+        测量文本包围盒，结果按(字体, 文本, 描边宽度)缓存
+
+        直接使用字体的getbbox，无需为每次测量创建临时图像与绘图对象。
+        字体对象由_load_font缓存，因此可作为缓存键的一部分。
+
+        Pillow>=9.0的getbbox/textbbox均接受stroke_width，无需逐次以TypeError探测；
+        仅Pillow 9.2之前的内置位图字体没有getbbox，按属性判断回退到getsize。
+
+        Returns:
+            (bbox, padding): 相对绘制原点的包围盒，以及字体不支持描边时需补偿的尺寸
+        """
+        stroke_width = max(0, stroke_width)
+        key = (font, text, stroke_width)
+        cached = self._text_bbox_cache.get(key)
+        if cached is not None:
+            return cached
+
+        padding = 0
+        if "\n" in text:
+            # 多行文本交由ImageDraw按行排版测量
+            bbox = self._dummy_draw.textbbox((0, 0), text, font=font, stroke_width=stroke_width)
+        elif hasattr(font, 'getbbox'):
+            bbox = font.getbbox(text, stroke_width=stroke_width)
+        else:
+            size = font.getsize(text)
+            bbox = (0, 0, size[0], size[1])
+            padding = stroke_width * 2
+
+        if len(self._text_bbox_cache) >= self.MAX_TEXT_BBOX_CACHE:
+            self._text_bbox_cache.clear()
+        result = (tuple(bbox), padding)
+        self._text_bbox_cache[key] = result
+        return result
+
     def _get_image_watermark_size(self, watermark_path: str, scale: float,
                                   rotation: int) -> Tuple[int, int]:
-        if not watermark_path or not os.path.exists(watermark_path):
+        entry = self._watermark_entry(watermark_path)
+        if entry is None:
             return 0, 0
 
-        if watermark_path not in self._watermark_cache:
-            try:
-                self._watermark_cache[watermark_path] = Image.open(watermark_path).convert('RGBA')
-            except Exception:
-                return 0, 0
-
-        wm_img = self._watermark_cache[watermark_path]
+        wm_img = entry[1]
         scale = max(0.05, min(scale, 10.0))
         width = max(1, int(wm_img.width * scale))
         height = max(1, int(wm_img.height * scale))
         return self._rotated_bounds(width, height, rotation)
 
+    def _path_mtime(self, path: str) -> Optional[int]:
+        """返回文件修改时间，文件不存在时返回None；结果在WATERMARK_STAT_TTL内复用"""
+        if not path:
+            return None
+        now = time.monotonic()
+        with self._watermark_lock:
+            cached = self._path_stat_cache.get(path)
+        if cached is not None and now - cached[0] < self.WATERMARK_STAT_TTL:
+            return cached[1]
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        with self._watermark_lock:
+            self._path_stat_cache[path] = (now, mtime)
+            self._path_stat_cache.move_to_end(path)
+            while len(self._path_stat_cache) > self.MAX_PATH_STAT_CACHE:
+                self._path_stat_cache.popitem(last=False)
+        return mtime
+
+    def _path_exists(self, path: str) -> bool:
+        return self._path_mtime(path) is not None
+
+    def _watermark_entry(self, watermark_path: str) -> Optional[Tuple[int, Image.Image]]:
+        """获取水印图片的(修改时间ns, RGBA图像)，文件被修改后重新读取"""
+        mtime = self._path_mtime(watermark_path)
+        if mtime is None:
+            return None
+        with self._watermark_lock:
+            entry = self._watermark_cache.get(watermark_path)
+            if entry is not None and entry[0] == mtime:
+                self._watermark_cache.move_to_end(watermark_path)
+                return entry
+        try:
+            with Image.open(watermark_path) as source:
+                entry = (mtime, source.convert('RGBA'))
+        except Exception:
+            return None
+        with self._watermark_lock:
+            self._watermark_cache[watermark_path] = entry
+            self._watermark_cache.move_to_end(watermark_path)
+            while len(self._watermark_cache) > self.MAX_WATERMARK_CACHE:
+                self._watermark_cache.popitem(last=False)
+        return entry
+
     @staticmethod
     def _rotated_corners(anchor_x: float, anchor_y: float, width: int, height: int,
                          position: Tuple[int, int], rotation: int) -> Tuple[Tuple[float, float], ...]:
@@ -430,20 +751,14 @@ class ImageProcessor:
         if rotation % 360 == 0:
             return tuple((cx + x, cy + y) for x, y in corners)
 
-        theta = math.radians(rotation)
-        cos_t = math.cos(theta)
-        sin_t = math.sin(theta)
-
-        rotated = []
-        for x, y in corners:
-            rotated_x = x * cos_t - y * sin_t
-            rotated_y = x * sin_t + y * cos_t
-            rotated.append((cx + rotated_x, cy + rotated_y))
-
-        return tuple(rotated)
+        cos_t, sin_t = _rotation_trig(rotation)
+        return tuple(
+            (cx + (x * cos_t - y * sin_t), cy + (x * sin_t + y * cos_t))
+            for x, y in corners
+        )
 
-    @staticmethod
-    def _calculate_grid_position(image_size: Tuple[int, int], watermark_size: Tuple[int, int],
+    @classmethod
+    def _calculate_grid_position(cls, image_size: Tuple[int, int], watermark_size: Tuple[int, int],
                                  position_type: str, margin: int = 20) -> Tuple[int, int]:
         img_width, img_height = image_size
         wm_width, wm_height = watermark_size
@@ -454,28 +769,24 @@ class ImageProcessor:
         half_w = wm_width / 2
         half_h = wm_height / 2
 
-        left_x = margin + half_w
-        right_x = max(margin + half_w, img_width - margin - half_w)
-        center_x = img_width / 2
-
-        top_y = margin + half_h
-        bottom_y = max(margin + half_h, img_height - margin - half_h)
-        center_y = img_height / 2
-
-        positions = {
-            'top-left': (left_x, top_y),
-            'top-center': (center_x, top_y),
-            'top-right': (right_x, top_y),
-            'middle-left': (left_x, center_y),
-            'center': (center_x, center_y),
-            'middle-right': (right_x, center_y),
-            'bottom-left': (left_x, bottom_y),
-            'bottom-center': (center_x, bottom_y),
-            'bottom-right': (right_x, bottom_y)
-        }
+        # 只计算选中格子对应的坐标，无需每次构建完整的九宫格表
+        column, row = cls.GRID_POSITIONS.get(position_type, cls.GRID_POSITIONS['bottom-right'])
 
-        chosen = positions.get(position_type, positions['bottom-right'])
-        return int(round(chosen[0])), int(round(chosen[1]))
+        if column == 0:
+            x = margin + half_w
+        elif column == 1:
+            x = img_width / 2
+        else:
+            x = max(margin + half_w, img_width - margin - half_w)
+
+        if row == 0:
+            y = margin + half_h
+        elif row == 1:
+            y = img_height / 2
+        else:
+            y = max(margin + half_h, img_height - margin - half_h)
+
+        return int(round(x)), int(round(y))
 
     @staticmethod
     def _clamp_position(position: Union[Tuple[float, float], Tuple[int, int]],
@@ -515,29 +826,48 @@ class ImageProcessor:
         Returns:
             bool: 是否加载成功
         """
+        # 检查文件格式（str.endswith直接接受后缀元组）
+        if not file_path.lower().endswith(self.SUPPORTED_INPUT_FORMATS):
+            return False
+        
+        # 一次stat同时完成存在性检查并取得修改时间
         try:
-            if not os.path.exists(file_path):
-                return False
-                
-            # 检查文件格式
-            if not any(file_path.lower().endswith(fmt) for fmt in self.SUPPORTED_INPUT_FORMATS):
-                return False
-                
-            # 加载图像
-            image = Image.open(file_path)
-            # 转换为RGBA模式以支持透明度
-            if image.mode != 'RGBA':
-                image = image.convert('RGBA')
-                
-            self.images[file_path] = image
-            if self.current_image_path is None:
-                self.current_image_path = file_path
-                
-            return True
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except OSError:
+            return False
+        
+        return self._load_image_fast(file_path, mtime_ns)
+    
+    def _load_image_fast(self, file_path: str, mtime_ns: int) -> bool:
+        """在调用方已确认文件存在且格式受支持时登记图像"""
+        meta = self._probe_image(file_path, mtime_ns)
+        if meta is None:
+            return False
+        self._register_image(file_path, meta)
+        return True
+    
+    @staticmethod
+    def _probe_image(file_path: str, mtime_ns: int) -> Optional[ImageMeta]:
+        """读取文件头信息并校验文件，不解码像素（线程安全）"""
+        try:
+            with Image.open(file_path) as image:
+                size, mode = image.size, image.mode
+                image.verify()
+            return ImageMeta(size, mode, mtime_ns)
             
         except Exception as e:
             print(f"加载图像失败: {e}")
-            return False
+            return None
+    
+    def _register_image(self, file_path: str, meta: ImageMeta) -> None:
+        self.images[file_path] = meta
+        if self._image_dirs is not None:
+            self._image_dirs.add(os.path.dirname(file_path))
+        with self._decoded_lock:
+            self._decoded_cache.pop(file_path, None)
+            self._decoded_refs.pop(file_path, None)
+        if self.current_image_path is None:
+            self.current_image_path = file_path
     
     def load_images_from_folder(self, folder_path: str) -> int:
         """
@@ -549,21 +879,47 @@ class ImageProcessor:
         Returns:
             int: 成功加载的图像数量
         """
-        count = 0
+        candidates: List[Tuple[str, int]] = []
         try:
-            for filename in os.listdir(folder_path):
-                file_path = os.path.join(folder_path, filename)
-                if os.path.isfile(file_path) and self.load_image(file_path):
-                    count += 1
+            # scandir在读取目录时即带回文件类型，避免逐个isfile/exists
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if not entry.name.lower().endswith(self.SUPPORTED_INPUT_FORMATS):
+                        continue
+                    if not entry.is_file():
+                        continue
+                    candidates.append((entry.path, entry.stat().st_mtime_ns))
         except Exception as e:
             print(f"批量加载图像失败: {e}")
-            
+        
+        if not candidates:
+            return 0
+        
+        # 各文件的读取与校验相互独立，并行执行以重叠I/O；结果按目录顺序登记
+        if len(candidates) == 1:
+            metas = [self._probe_image(*candidates[0])]
+        else:
+            workers = min(self.PROBE_MAX_WORKERS, len(candidates))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                metas = list(executor.map(lambda item: self._probe_image(*item), candidates))
+        
+        count = 0
+        for (file_path, _), meta in zip(candidates, metas):
+            if meta is not None:
+                self._register_image(file_path, meta)
+                count += 1
         return count
     
     def get_image_list(self) -> list:
         """获取已加载的图像列表"""
         return list(self.images.keys())
     
+    def get_image_dirs(self) -> Set[str]:
+        """获取已加载图像所在的文件夹集合（调用方不应修改返回的集合）"""
+        if self._image_dirs is None:
+            self._image_dirs = {os.path.dirname(path) for path in self.images}
+        return self._image_dirs
+    
     def set_current_image(self, file_path: str) -> bool:
         """
         设置当前预览的图像
@@ -579,63 +935,323 @@ class ImageProcessor:
             return True
         return False
     
+    def get_image(self, file_path: str) -> Optional[Image.Image]:
+        """
+        获取已加载图像的像素数据，按需解码并保留最近使用的若干张
+        
+        不透明图像保持RGB模式，只有带透明信息的图像才转换为RGBA，
+        需要透明通道的绘制操作自行处理模式。
+        
+        Args:
+            file_path: 图像文件路径
+            
+        Returns:
+            Image.Image: 解码后的图像，未加载或解码失败时返回None
+        """
+        if file_path not in self.images:
+            return None
+        
+        with self._decoded_lock:
+            image = self._decoded_cache.get(file_path)
+            if image is not None:
+                self._decoded_cache.move_to_end(file_path)
+                return image
+            image = self._decoded_refs.get(file_path)
+            if image is not None:
+                self._remember_decoded(file_path, image)
+                return image
+        
+        try:
+            with Image.open(file_path) as source:
+                image = self._to_working_mode(source)
+        except Exception as e:
+            print(f"解码图像失败: {e}")
+            return None
+        
+        with self._decoded_lock:
+            self._decoded_refs[file_path] = image
+            self._remember_decoded(file_path, image)
+        return image
+    
+    def _remember_decoded(self, file_path: str, image: Image.Image) -> None:
+        """放入解码LRU（调用方需持有_decoded_lock）"""
+        self._decoded_cache[file_path] = image
+        while len(self._decoded_cache) > self.MAX_DECODED_IMAGES:
+            self._decoded_cache.popitem(last=False)
+    
+    @staticmethod
+    def _to_working_mode(image: Image.Image) -> Image.Image:
+        """将解码图像规范为RGB（不透明）或RGBA（含透明信息）"""
+        if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
+            return image.convert('RGBA')
+        if image.mode == 'RGB':
+            image.load()
+            return image
+        return image.convert('RGB')
+    
     def get_current_image(self) -> Optional[Image.Image]:
         """获取当前图像"""
-        if self.current_image_path and self.current_image_path in self.images:
-            return self.images[self.current_image_path]
+        if self.current_image_path:
+            return self.get_image(self.current_image_path)
         return None
     
-    def create_thumbnail(self, file_path: str, size: Tuple[int, int] = (150, 150)) -> Optional[QPixmap]:
+    def create_thumbnail(self, file_path: str, size: Tuple[int, int] = (150, 150),
+                         resample: Image.Resampling = Image.Resampling.BILINEAR) -> Optional["QPixmap"]:
         """
         创建缩略图
         
         Args:
             file_path: 图像文件路径
             size: 缩略图尺寸
+            resample: 重采样滤镜，预览默认BILINEAR，导出质量需求可传LANCZOS
             
         Returns:
             QPixmap: 缩略图pixmap对象
         """
-        if file_path not in self.images:
+        key = self._thumbnail_key(file_path, size, resample)
+        if key is None:
+            return None
+        pixmap = self._cached_thumbnail(key)
+        if pixmap is not None:
+            return pixmap
+        image = self._render_thumbnail(key)
+        if image is None:
             return None
+        # 缩略图已是RGB，直接转换为QPixmap
+        pixmap = self._pil_rgb_to_qpixmap(image)
+        self._store_thumbnail(key, pixmap)
+        return pixmap
+    
+    def create_thumbnails_batch(self, file_paths: List[str], size: Tuple[int, int] = (150, 150),
+                                resample: Image.Resampling = Image.Resampling.BILINEAR) -> List[Optional["QPixmap"]]:
+        """
+        批量创建缩略图，解码与缩放在线程池中并行执行
+        
+        QPixmap只能在GUI线程中创建，因此工作线程只产出PIL缩略图，
+        由调用线程统一转换。已缓存的缩略图直接返回。
+        
+        Args:
+            file_paths: 图像文件路径列表
+            size: 缩略图尺寸
+            resample: 重采样滤镜
             
+        Returns:
+            List[Optional[QPixmap]]: 与file_paths一一对应的缩略图
+        """
+        results, pending = self.split_cached_thumbnails(file_paths, size, resample)
+        if not pending:
+            return results
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            images = list(executor.map(lambda job: self.render_thumbnail(job[1]), pending))
+        for (i, key), image in zip(pending, images):
+            results[i] = self.finish_thumbnail(key, image)
+        return results
+    
+    def split_cached_thumbnails(self, file_paths: List[str], size: Tuple[int, int] = (150, 150),
+                                resample: Image.Resampling = Image.Resampling.BILINEAR
+                                ) -> Tuple[List[Optional["QPixmap"]], List[Tuple[int, ThumbnailKey]]]:
+        """
+        查找内存缓存中的缩略图（须在GUI线程调用）
+        
+        Returns:
+            Tuple: (与file_paths一一对应的已缓存缩略图, 待生成的(序号, 缓存键)列表)
+        """
+        keys = [self._thumbnail_key(path, size, resample) for path in file_paths]
+        results = [self._cached_thumbnail(key) if key is not None else None for key in keys]
+        pending = [(i, key) for i, key in enumerate(keys) if key is not None and results[i] is None]
+        return results, pending
+    
+    def render_thumbnail(self, key: ThumbnailKey) -> Optional[Image.Image]:
+        """生成缩略图图像，可在工作线程中调用"""
+        return self._render_thumbnail(key)
+    
+    def finish_thumbnail(self, key: ThumbnailKey, image: Optional[Image.Image]) -> Optional["QPixmap"]:
+        """将工作线程生成的缩略图转换为QPixmap并写入缓存（须在GUI线程调用）"""
+        if image is None:
+            return None
+        pixmap = self._pil_rgb_to_qpixmap(image)
+        self._store_thumbnail(key, pixmap)
+        return pixmap
+    
+    def _thumbnail_key(self, file_path: str, size: Tuple[int, int],
+                       resample: Image.Resampling) -> Optional[ThumbnailKey]:
+        """缩略图缓存键，包含文件修改时间以便文件被编辑后自动失效"""
+        if file_path not in self.images:
+            return None
         try:
-            image = self.images[file_path].copy()
-            
-            # 确保图像是RGB模式，避免透明度和调色板问题
-            if image.mode == 'RGBA':
-                # 对于RGBA图像，创建白色背景并合成
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                background.paste(image, mask=image.split()[-1])  # 使用alpha通道作为mask
-                image = background
-            elif image.mode in ('P', 'L', 'LA'):
-                # 转换调色板和灰度图像为RGB
-                image = image.convert('RGB')
-            elif image.mode not in ('RGB', 'YCbCr'):
-                # 其他模式也转换为RGB
-                image = image.convert('RGB')
-            
-            # 创建缩略图，保持宽高比
-            image.thumbnail(size, Image.Resampling.LANCZOS)
-            
-            # 转换为QPixmap
-            return self.pil_to_qpixmap(image)
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except OSError as e:
+            print(f"创建缩略图失败: {e}")
+            return None
+        return (file_path, mtime_ns, (int(size[0]), int(size[1])), int(resample))
+    
+    def _cached_thumbnail(self, key: ThumbnailKey) -> Optional["QPixmap"]:
+        """从内存缓存获取缩略图（LRU）"""
+        pixmap = self._thumb_cache.get(key)
+        if pixmap is not None:
+            self._thumb_cache.move_to_end(key)
+        return pixmap
+    
+    def _store_thumbnail(self, key: ThumbnailKey, pixmap: "QPixmap"):
+        """写入内存缓存，超出上限时淘汰最久未使用的缩略图"""
+        if pixmap is None or pixmap.isNull():
+            return
+        self._thumb_cache[key] = pixmap
+        self._thumb_cache.move_to_end(key)
+        while len(self._thumb_cache) > self.MAX_THUMBNAIL_CACHE:
+            self._thumb_cache.popitem(last=False)
+    
+    def _thumbnail_disk_path(self, key: ThumbnailKey) -> Optional[str]:
+        """磁盘缓存文件路径，文件名为缓存键的哈希"""
+        if not self._thumbnail_cache_dir:
+            return None
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self._thumbnail_cache_dir, f"{digest}.png")
+    
+    def _prune_thumbnail_disk_cache(self) -> None:
+        """磁盘缩略图缓存超过MAX_THUMBNAIL_DISK_BYTES时，按修改时间从旧到新删除文件"""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self._thumbnail_cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".png") or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+        except OSError:
+            return
+        if total <= self.MAX_THUMBNAIL_DISK_BYTES:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"清理缩略图缓存失败: {e}")
+                continue
+            total -= size
+            if total <= self.MAX_THUMBNAIL_DISK_BYTES:
+                break
+    
+    def _render_thumbnail(self, key: ThumbnailKey) -> Optional[Image.Image]:
+        """生成RGB缩略图（纯PIL操作，可在工作线程中执行）"""
+        file_path, _, size, resample = key
+        disk_path = self._thumbnail_disk_path(key)
+        if disk_path and os.path.isfile(disk_path):
+            try:
+                with Image.open(disk_path) as cached_thumb:
+                    thumb = cached_thumb.convert('RGB')
+                # 刷新修改时间，使启动时的清理优先删除久未使用的缩略图
+                os.utime(disk_path)
+                return thumb
+            except Exception as e:
+                print(f"读取缩略图缓存失败: {e}")
             
+        try:
+            # 已解码的图像直接复用，否则从文件解码且不占用解码缓存
+            with self._decoded_lock:
+                cached = self._decoded_cache.get(file_path)
+            if cached is not None:
+                image = self._shrink_for_thumbnail(cached, size, resample)
+            else:
+                with Image.open(file_path) as source:
+                    # JPEG可在解码阶段按DCT缩放，其他格式忽略
+                    source.draft('RGB', (size[0] * self.THUMBNAIL_PREREDUCE_FACTOR,
+                                         size[1] * self.THUMBNAIL_PREREDUCE_FACTOR))
+                    image = self._shrink_for_thumbnail(source, size, resample)
+            # 缩小后再合成白色背景，拍平只作用于缩略图大小的图像
+            image = self._to_display_rgb(image)
         except Exception as e:
             print(f"创建缩略图失败: {e}")
             return None
+        
+        if disk_path:
+            self._save_thumbnail_to_disk(image, disk_path)
+        return image
+    
+    @staticmethod
+    def _save_thumbnail_to_disk(image: Image.Image, disk_path: str):
+        """将缩略图写入磁盘缓存，先写临时文件再替换，避免读到半写入的文件"""
+        tmp_path = f"{disk_path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+            image.save(tmp_path, 'PNG', compress_level=1)
+            os.replace(tmp_path, disk_path)
+        except Exception as e:
+            print(f"保存缩略图缓存失败: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    @classmethod
+    def _shrink_for_thumbnail(cls, image: Image.Image, size: Tuple[int, int],
+                              resample: Image.Resampling) -> Image.Image:
+        """
+        缩小为保持宽高比的缩略图，不修改输入图像（输入可能是解码缓存中的图像）
+        
+        透明信息保留到缩小之后；缩小比例较大时先用NEAREST粗缩以减少滤镜计算量。
+        """
+        if image.mode not in ('RGB', 'RGBA', 'L') or 'transparency' in image.info:
+            # 调色板等模式无法用高质量滤镜缩放，先转换为RGB/RGBA
+            has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+        
+        width, height = image.size
+        ratio = min(size[0] * cls.THUMBNAIL_PREREDUCE_FACTOR / width,
+                    size[1] * cls.THUMBNAIL_PREREDUCE_FACTOR / height)
+        if ratio < 1:
+            small = image.resize((max(1, round(width * ratio)), max(1, round(height * ratio))),
+                                 Image.Resampling.NEAREST)
+        else:
+            small = image.copy()
+        small.thumbnail(size, resample)
+        return small
+    
+    @classmethod
+    def _to_display_rgb(cls, image: Image.Image) -> Image.Image:
+        """转换为用于显示的RGB副本，透明区域合成到白色背景"""
+        if image.mode == 'RGBA':
+            return cls._flatten_rgba(image)
+        if image.mode in ('LA', 'PA') or 'transparency' in image.info:
+            return cls._flatten_rgba(image.convert('RGBA'))
+        # 调色板、灰度及其他模式直接转换为RGB
+        return image.convert('RGB')
     
     def _load_font(self, font_family: str, font_size: int, bold: bool, italic: bool,
                    font_path: Optional[str] = None, font_index: int = 0,
                    style_name: str = "") -> ImageFont.FreeTypeFont:
-        """尝试根据字体族和样式加载字体，失败时回退到系统字体"""
+        """尝试根据字体族和样式加载字体，失败时回退到系统字体（结果按参数缓存）"""
         index = max(0, int(font_index or 0))
+        key = (font_family or "", font_size, bool(bold), bool(italic), font_path or "", index, style_name or "")
+        font_cache = self._thread_font_caches()[0]
+        font = font_cache.get(key)
+        if font is None:
+            font = self._load_font_uncached(font_family, font_size, bold, italic, font_path, index, style_name)
+            if len(font_cache) >= self.MAX_TRUETYPE_CACHE:
+                font_cache.popitem(last=False)
+            font_cache[key] = font
+        else:
+            font_cache.move_to_end(key)
+        return font
+
+    def _thread_font_caches(self) -> Tuple["OrderedDict[tuple, ImageFont.FreeTypeFont]",
+                                           "OrderedDict[Tuple[str, int, int], ImageFont.FreeTypeFont]"]:
+        """返回当前线程的(样式字体LRU, TrueType字体LRU)"""
+        caches = getattr(self._font_local, 'caches', None)
+        if caches is None:
+            caches = self._font_local.caches = (OrderedDict(), OrderedDict())
+        return caches
+
+    def _load_font_uncached(self, font_family: str, font_size: int, bold: bool, italic: bool,
+                            font_path: Optional[str], index: int,
+                            style_name: str) -> ImageFont.FreeTypeFont:
+        """实际执行字体解析与加载"""
 
         # 如果提供了字体路径，先验证它是否匹配所需样式
         if font_path:
             try:
-                test_font = ImageFont.truetype(font_path, 32, index=index)
-                actual_family, actual_style = test_font.getname()
+                actual_family, actual_style = self._get_font_name(font_path, index)
                 actual_style_lower = (actual_style or "").lower()
                 
                 # 检查加载的字体是否真的包含所需样式
@@ -652,7 +1268,7 @@ class ImageProcessor:
                 
                 # 如果样式匹配或者不需要特殊样式，使用该字体
                 if style_matches or (not bold and not italic):
-                    return ImageFont.truetype(font_path, font_size, index=index)
+                    return self._get_truetype(font_path, font_size, index)
                 else:
                     print(f"Font path {font_path} style mismatch, re-resolving for bold={bold}, italic={italic}")
             except Exception as e:
@@ -663,7 +1279,7 @@ class ImageProcessor:
         if resolved:
             path, resolved_index = resolved
             try:
-                loaded = ImageFont.truetype(path, font_size, index=resolved_index)
+                loaded = self._get_truetype(path, font_size, resolved_index)
                 print(f"Loaded font: {path} (index={resolved_index}) for {font_family} bold={bold} italic={italic}")
                 return loaded
             except Exception as e:
@@ -682,18 +1298,42 @@ class ImageProcessor:
         for variant in styled_variants:
             for suffix in ("", ".ttf", ".otf", ".ttc"):
                 try:
-                    return ImageFont.truetype(variant + suffix, font_size)
+                    return self._get_truetype(variant + suffix, font_size)
                 except Exception:
                     continue
 
         for fallback in ("arial.ttf", "Helvetica.ttc"):
             try:
-                return ImageFont.truetype(fallback, font_size)
+                return self._get_truetype(fallback, font_size)
             except Exception:
                 continue
 
         return ImageFont.load_default()
 
+    def _get_truetype(self, path: str, size: int, index: int = 0) -> ImageFont.FreeTypeFont:
+        """按(路径, 索引, 字号)缓存FreeType字体对象，避免重复解析字体文件"""
+        key = (path, index, size)
+        truetype_cache = self._thread_font_caches()[1]
+        font = truetype_cache.get(key)
+        if font is None:
+            font = ImageFont.truetype(path, size, index=index)
+            if len(truetype_cache) >= self.MAX_TRUETYPE_CACHE:
+                # 超出上限时淘汰最久未使用的字体
+                truetype_cache.popitem(last=False)
+            truetype_cache[key] = font
+        else:
+            truetype_cache.move_to_end(key)
+        return font
+
+    def _get_font_name(self, path: str, index: int = 0) -> Tuple[str, str]:
+        """获取字体文件的(族名, 样式名)，结果按(路径, 索引)缓存"""
+        key = (path, index)
+        name = self._font_name_cache.get(key)
+        if name is None:
+            name = self._get_truetype(path, 32, index).getname()
+            self._font_name_cache[key] = name
+        return name
+
     def resolve_font_face(self, font_family: str, bold: bool, italic: bool,
                           style_name: str = "") -> Optional[Tuple[str, int]]:
         """解析字体的真实路径和索引，若无法解析则返回None"""
@@ -727,9 +1367,7 @@ class ImageProcessor:
 
         return None, None
 
-    @staticmethod
-    def _normalize_family_name(name: str) -> str:
-        return "".join(ch for ch in name.lower() if ch.isalnum())
+    _normalize_family_name = staticmethod(_normalize_family)
 
     def measure_text(self, text: str, font_family: str, font_size: int,
                      bold: bool, italic: bool, stroke: bool, stroke_width: int,
@@ -759,191 +1397,238 @@ class ImageProcessor:
                           shadow: bool = False, stroke: bool = False, rotation: int = 0,
                           shadow_offset: Tuple[int, int] = (2, 2), stroke_width: int = 1,
                           stroke_color: tuple = (0, 0, 0), font_path: Optional[str] = None,
-                          font_index: int = 0, style_name: str = "") -> Image.Image:
-        """添加高级文本水印"""
+                          font_index: int = 0, style_name: str = "",
+                          copy_first: bool = True) -> Image.Image:
+        """添加高级文本水印
+
+        copy_first为False且输入已是RGB/RGBA时直接在输入图像上合成，
+        供已持有独立副本的调用方（如apply_watermark）跳过一次整图复制。
+        RGB底图不转换为RGBA，而是以文字层的alpha作为蒙版粘贴。
+        """
         try:
-            base_image = image.convert('RGBA') if image.mode != 'RGBA' else image.copy()
+            if image.mode not in ('RGB', 'RGBA'):
+                base_image = image.convert('RGBA')
+            elif copy_first:
+                base_image = image.copy()
+            else:
+                base_image = image
             font = self._load_font(font_family, font_size, bold, italic, font_path, font_index, style_name)
+            stroke_width = stroke_width if stroke else 0
+            canvas = self._get_overlay(
+                ('text', font, text, tuple(color), opacity, bool(shadow),
+                 tuple(shadow_offset) if shadow else None, stroke_width,
+                 tuple(stroke_color) if stroke_width else None, rotation),
+                lambda: self._rotate_overlay(
+                    self._scale_alpha(
+                        self._render_text_layer(font, text, color, shadow, shadow_offset,
+                                                stroke_width, stroke_color),
+                        opacity
+                    ),
+                    rotation
+                )
+            )
 
-            dummy = Image.new('RGBA', (1, 1), (0, 0, 0, 0))
-            dummy_draw = ImageDraw.Draw(dummy)
+            self._composite_overlay(base_image, canvas, position)
+            return base_image
 
-            bbox = None
-            padding = 0
-            if stroke and stroke_width > 0:
-                try:
-                    bbox = dummy_draw.textbbox(
-                        (0, 0),
-                        text,
-                        font=font,
-                        stroke_width=stroke_width,
-                        stroke_fill=(*stroke_color[:3], opacity)
-                    )
-                except TypeError:
-                    try:
-                        bbox = dummy_draw.textbbox(
-                            (0, 0),
-                            text,
-                            font=font,
-                            stroke_width=stroke_width
-                        )
-                        padding = stroke_width * 2
-                    except TypeError:
-                        padding = stroke_width * 2
-            if bbox is None:
-                try:
-                    bbox = dummy_draw.textbbox((0, 0), text, font=font)
-                except AttributeError:
-                    size = dummy_draw.textsize(text, font=font)
-                    bbox = (0, 0, size[0], size[1])
-
-            text_width = (bbox[2] - bbox[0]) + padding
-            text_height = (bbox[3] - bbox[1]) + padding
-
-            offset_from_origin_x = -bbox[0]
-            offset_from_origin_y = -bbox[1]
-
-            offset_x, offset_y = shadow_offset if shadow else (0, 0)
-            extra_left = max(0, -offset_x)
-            extra_top = max(0, -offset_y)
-            extra_right = max(0, offset_x)
-            extra_bottom = max(0, offset_y)
-
-            canvas_width = text_width + extra_left + extra_right
-            canvas_height = text_height + extra_top + extra_bottom
-
-            canvas = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(canvas)
-            text_pos = (
-                extra_left + offset_from_origin_x,
-                extra_top + offset_from_origin_y
-            )
+        except Exception as e:
+            print(f"添加文本水印失败: {e}")
+            return image
 
-            def manual_stroke(target_draw, base_position, alpha):
-                if not (stroke and stroke_width > 0):
-                    return
-                stroke_rgba = (*stroke_color[:3], alpha)
-                radius = max(1, stroke_width)
-                for dx in range(-radius, radius + 1):
-                    for dy in range(-radius, radius + 1):
-                        if dx == 0 and dy == 0:
-                            continue
-                        target_draw.text(
-                            (base_position[0] + dx, base_position[1] + dy),
-                            text,
-                            font=font,
-                            fill=stroke_rgba
-                        )
-
-            def render_text(target_draw, base_position, fill_color, apply_stroke):
-                if apply_stroke and stroke and stroke_width > 0:
-                    try:
-                        target_draw.text(
-                            base_position,
-                            text,
-                            font=font,
-                            fill=fill_color,
-                            stroke_width=stroke_width,
-                            stroke_fill=(*stroke_color[:3], fill_color[3])
-                        )
-                        return
-                    except TypeError:
-                        try:
-                            target_draw.text(
-                                base_position,
-                                text,
-                                font=font,
-                                fill=fill_color,
-                                stroke_width=stroke_width
-                            )
-                            return
-                        except TypeError:
-                            manual_stroke(target_draw, base_position, fill_color[3])
-                            target_draw.text(base_position, text, font=font, fill=fill_color)
-                            return
-                target_draw.text(base_position, text, font=font, fill=fill_color)
-
-            if shadow:
-                shadow_color_rgba = (0, 0, 0, min(255, opacity))
-                render_text(
-                    draw,
-                    (text_pos[0] + offset_x, text_pos[1] + offset_y),
-                    shadow_color_rgba,
-                    apply_stroke=False
-                )
+    def _get_overlay(self, key: tuple, factory) -> Image.Image:
+        """从水印层缓存获取（LRU），未命中时调用factory生成；返回的图像不得原地修改"""
+        with self._overlay_lock:
+            overlay = self._overlay_cache.get(key)
+            if overlay is not None:
+                self._overlay_cache.move_to_end(key)
+                return overlay
+
+        overlay = factory()
+        with self._overlay_lock:
+            self._overlay_cache[key] = overlay
+            while len(self._overlay_cache) > self.MAX_OVERLAY_CACHE:
+                self._overlay_cache.popitem(last=False)
+        return overlay
 
-            text_color_rgba = (*color[:3], opacity)
-            render_text(draw, text_pos, text_color_rgba, apply_stroke=True)
+    @staticmethod
+    def _rotate_overlay(overlay: Image.Image, rotation: int) -> Image.Image:
+        """旋转水印层：整圈时原样返回，直角时直接转置像素，其余角度使用BICUBIC插值"""
+        angle = rotation % 360
+        if not angle:
+            return overlay
+        transpose = _RIGHT_ANGLE_TRANSPOSE.get(angle)
+        if transpose is not None:
+            return overlay.transpose(transpose)
+        return overlay.rotate(rotation, resample=Image.BICUBIC, expand=True)
 
-            if rotation:
-                canvas = canvas.rotate(rotation, resample=Image.BICUBIC, expand=True)
+    @staticmethod
+    def _composite_overlay(base_image: Image.Image, overlay: Image.Image,
+                           position: Tuple[int, int]) -> None:
+        """将水印层以position为中心原地合成到base_image（RGB或RGBA）上，超出边界的部分被裁掉"""
+        dest_x = int(round(position[0] - overlay.width / 2))
+        dest_y = int(round(position[1] - overlay.height / 2))
+
+        src_left = max(0, -dest_x)
+        src_top = max(0, -dest_y)
+        src_right = min(overlay.width, base_image.width - dest_x)
+        src_bottom = min(overlay.height, base_image.height - dest_y)
+
+        if src_left >= src_right or src_top >= src_bottom:
+            return
 
-            dest_x = int(round(position[0] - canvas.width / 2))
-            dest_y = int(round(position[1] - canvas.height / 2))
+        # 仅在水印覆盖的区域内原地合成，无需整图大小的透明覆盖层
+        if base_image.mode == 'RGBA':
+            base_image.alpha_composite(overlay, dest=(max(dest_x, 0), max(dest_y, 0)),
+                                       source=(src_left, src_top, src_right, src_bottom))
+        else:
+            # paste在C层自行裁剪越界部分，无需先crop出可见区域的副本
+            base_image.paste(overlay, (dest_x, dest_y), overlay)
+
+    @staticmethod
+    def _scale_alpha(layer: Image.Image, opacity: int) -> Image.Image:
+        """返回alpha通道按opacity/255缩放后的RGBA副本，完全不透明时直接返回原图
 
-            src_left = max(0, -dest_x)
-            src_top = max(0, -dest_y)
-            src_right = min(canvas.width, base_image.width - dest_x)
-            src_bottom = min(canvas.height, base_image.height - dest_y)
+        以逐通道查找表一次point完成，不再分别复制整图、提取并回写alpha通道。
+        """
+        if opacity >= 255:
+            return layer
+        return layer.point(_opacity_lut(max(0, opacity)))
+
+    def _render_text_layer(self, font: ImageFont.FreeTypeFont, text: str, color: tuple,
+                           shadow: bool, shadow_offset: Tuple[int, int],
+                           stroke_width: int, stroke_color: tuple) -> Image.Image:
+        """获取未旋转、完全不透明的文字层，相同参数的结果会被缓存（批量导出时所有图片共用）
+
+        不透明度不参与缓存键，由调用方通过_scale_alpha整体施加，
+        因此拖动不透明度滑块时无需重新光栅化文字。
+        返回的图像为缓存共享对象，调用方不得原地修改。
+        """
+        key = (font, text, tuple(color), bool(shadow),
+               tuple(shadow_offset) if shadow else None, stroke_width,
+               tuple(stroke_color) if stroke_width else None)
+        with self._text_layer_lock:
+            layer = self._text_layer_cache.get(key)
+            if layer is not None:
+                self._text_layer_cache.move_to_end(key)
+                return layer
+
+        layer = self._render_text_layer_uncached(font, text, color, shadow, shadow_offset,
+                                                 stroke_width, stroke_color)
+        with self._text_layer_lock:
+            self._text_layer_cache[key] = layer
+            while len(self._text_layer_cache) > self.MAX_TEXT_LAYER_CACHE:
+                self._text_layer_cache.popitem(last=False)
+        return layer
+
+    def _render_text_layer_uncached(self, font: ImageFont.FreeTypeFont, text: str, color: tuple,
+                                    shadow: bool, shadow_offset: Tuple[int, int],
+                                    stroke_width: int, stroke_color: tuple) -> Image.Image:
+        """将文本连同阴影与描边绘制到恰好容纳它的透明画布上（未旋转）
+
+        阴影与正文共用同一画布，描边由Pillow在绘制正文时一次完成。
+        """
+        bbox, padding = self._text_bbox(font, text, stroke_width)
+
+        text_width = (bbox[2] - bbox[0]) + padding
+        text_height = (bbox[3] - bbox[1]) + padding
+
+        offset_x, offset_y = shadow_offset if shadow else (0, 0)
+        extra_left = max(0, -offset_x)
+        extra_top = max(0, -offset_y)
+        extra_right = max(0, offset_x)
+        extra_bottom = max(0, offset_y)
 
-            if src_left >= src_right or src_top >= src_bottom:
-                return base_image
+        canvas_width = text_width + extra_left + extra_right
+        canvas_height = text_height + extra_top + extra_bottom
 
-            cropped = canvas.crop((src_left, src_top, src_right, src_bottom))
+        canvas = Image.new('RGBA', (canvas_width, canvas_height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(canvas)
+        text_pos = (
+            extra_left - bbox[0],
+            extra_top - bbox[1]
+        )
 
-            overlay = Image.new('RGBA', base_image.size, (0, 0, 0, 0))
-            overlay.alpha_composite(
-                cropped,
-                dest=(max(dest_x, 0), max(dest_y, 0))
+        if shadow:
+            draw.text(
+                (text_pos[0] + offset_x, text_pos[1] + offset_y),
+                text,
+                font=font,
+                fill=(0, 0, 0, 255)
             )
 
-            return Image.alpha_composite(base_image, overlay)
+        self._draw_stroked_text(draw, text_pos, text, font, (*color[:3], 255),
+                                stroke_width, stroke_color)
+        return canvas
 
-        except Exception as e:
-            print(f"添加文本水印失败: {e}")
-            return image
+    @staticmethod
+    def _draw_stroked_text(draw: ImageDraw.ImageDraw, position: Tuple[int, int], text: str,
+                           font: ImageFont.FreeTypeFont, fill_color: tuple,
+                           stroke_width: int, stroke_color: tuple) -> None:
+        """绘制文本，stroke_width大于0时由Pillow的FreeType描边单次完成（Pillow>=6.2均支持）"""
+        if stroke_width <= 0:
+            draw.text(position, text, font=font, fill=fill_color)
+            return
+        draw.text(
+            position,
+            text,
+            font=font,
+            fill=fill_color,
+            stroke_width=stroke_width,
+            stroke_fill=(*stroke_color[:3], fill_color[3])
+        )
 
     def add_image_watermark(self, image: Image.Image, watermark_path: str,
                             position: Tuple[int, int], scale: float = 1.0,
-                            opacity: int = 128, rotation: int = 0) -> Image.Image:
-        """添加图片水印"""
+                            opacity: int = 128, rotation: int = 0,
+                            copy_first: bool = True) -> Image.Image:
+        """添加图片水印
+
+        copy_first为False且输入已是RGB/RGBA时直接在输入图像上合成，
+        与add_text_watermark一致，供已持有独立副本的调用方跳过一次整图复制。
+        """
         try:
-            if not watermark_path or not os.path.exists(watermark_path):
+            entry = self._watermark_entry(watermark_path)
+            if entry is None:
                 return image
 
-            if watermark_path not in self._watermark_cache:
-                wm_img = Image.open(watermark_path).convert('RGBA')
-                self._watermark_cache[watermark_path] = wm_img
-            else:
-                wm_img = self._watermark_cache[watermark_path]
-
-            watermark = wm_img.copy()
-            scale = max(0.05, min(scale, 10.0))
-            new_size = (max(1, int(watermark.width * scale)),
-                        max(1, int(watermark.height * scale)))
-            watermark = watermark.resize(new_size, Image.Resampling.LANCZOS)
-
-            if opacity < 255:
-                alpha = watermark.split()[-1]
-                alpha = alpha.point(lambda p: int(p * (opacity / 255)))
-                watermark.putalpha(alpha)
-
-            if rotation:
-                watermark = watermark.rotate(rotation, resample=Image.BICUBIC, expand=True)
-
-            base_image = image.convert('RGBA') if image.mode != 'RGBA' else image.copy()
-            overlay = Image.new('RGBA', base_image.size, (0, 0, 0, 0))
-
-            dest_x = int(round(position[0] - watermark.width / 2))
-            dest_y = int(round(position[1] - watermark.height / 2))
-            overlay.alpha_composite(watermark, dest=(dest_x, dest_y))
+            mtime, wm_img = entry
+            watermark = self._get_overlay(
+                ('image', watermark_path, mtime, scale, opacity, rotation),
+                lambda: self._render_image_watermark(watermark_path, mtime, wm_img, scale, opacity, rotation)
+            )
 
-            return Image.alpha_composite(base_image, overlay)
+            if image.mode not in ('RGB', 'RGBA'):
+                base_image = image.convert('RGBA')
+            elif copy_first:
+                base_image = image.copy()
+            else:
+                base_image = image
+            self._composite_overlay(base_image, watermark, position)
+            return base_image
 
         except Exception as e:
             print(f"添加图片水印失败: {e}")
             return image
     
+    def _render_image_watermark(self, watermark_path: str, mtime: int, wm_img: Image.Image,
+                                scale: float, opacity: int, rotation: int) -> Image.Image:
+        """缩放水印图片、应用不透明度并旋转
+
+        缩放结果按(路径, 修改时间, 目标尺寸)单独缓存，仅调整不透明度或旋转角度时
+        无需重新执行LANCZOS缩放。后续步骤均返回新图像，因此无需复制源水印。
+        """
+        scale = max(0.05, min(scale, 10.0))
+        new_size = (max(1, int(wm_img.width * scale)),
+                    max(1, int(wm_img.height * scale)))
+        if new_size == wm_img.size:
+            # 原尺寸时直接共用已缓存的源图，resize在此情况下只会整图复制
+            return self._rotate_overlay(self._scale_alpha(wm_img, opacity), rotation)
+        resized = self._get_overlay(
+            ('image-resized', watermark_path, mtime, new_size),
+            lambda: wm_img.resize(new_size, Image.Resampling.LANCZOS)
+        )
+        return self._rotate_overlay(self._scale_alpha(resized, opacity), rotation)
+    
     def calculate_position(self, image_size: Tuple[int, int], text: str,
                           position_type: str, font_size: int = 36,
                           font_family: str = "Arial", bold: bool = True,
@@ -982,55 +1667,17 @@ class ImageProcessor:
         """
         if file_path not in self.images:
             return False
-
-    def resize_image(self, image: Image.Image, method: str, target_width: int,
-                     target_height: int, percentage: int, keep_aspect: bool) -> Image.Image:
-        """按照指定方式调整图像大小"""
-        try:
-            current_width, current_height = image.size
-
-            if method == "percentage":
-                scale = max(1, percentage) / 100.0
-                new_width = max(1, int(current_width * scale))
-                new_height = max(1, int(current_height * scale))
-            elif method == "width":
-                new_width = max(1, target_width)
-                if keep_aspect:
-                    ratio = new_width / current_width
-                    new_height = max(1, int(current_height * ratio))
-                else:
-                    new_height = max(1, target_height if target_height > 0 else current_height)
-            elif method == "height":
-                new_height = max(1, target_height)
-                if keep_aspect:
-                    ratio = new_height / current_height
-                    new_width = max(1, int(current_width * ratio))
-                else:
-                    new_width = max(1, target_width if target_width > 0 else current_width)
-            else:
-                return image
-
-            if new_width == current_width and new_height == current_height:
-                return image
-
-            return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        except Exception as e:
-            print(f"调整图像尺寸失败: {e}")
-            return image
             
         try:
-            image = self.images[file_path]
+            image = self.get_image(file_path)
+            if image is None:
+                return False
             
             # 如果导出为JPEG，需要转换为RGB模式
-            if format.upper() == 'JPEG':
-                if image.mode == 'RGBA':
-                    # 创建白色背景
-                    background = Image.new('RGB', image.size, (255, 255, 255))
-                    background.paste(image, mask=image.split()[-1])  # 使用alpha通道作为mask
-                    image = background
-                image.save(output_path, format=format, quality=quality)
-            else:
-                image.save(output_path, format=format)
+            if format.upper() == 'JPEG' and image.mode == 'RGBA':
+                # 合成到白色背景
+                image = self._flatten_rgba(image)
+            self.save_image(image, output_path, format, quality)
                 
             return True
             
@@ -1038,7 +1685,163 @@ class ImageProcessor:
             print(f"导出图像失败: {e}")
             return False
     
-    def pil_to_qpixmap(self, pil_image: Image.Image) -> QPixmap:
+    def export_images_batch(self, jobs: List[Tuple[str, str, str, int]]) -> List[bool]:
+        """
+        并行导出多张图像
+        
+        Pillow的JPEG/PNG编码器在C层释放GIL，线程池即可让多个编码同时进行。
+        
+        Args:
+            jobs: (原始图像路径, 输出路径, 输出格式, JPEG质量) 列表
+            
+        Returns:
+            List[bool]: 与jobs一一对应的导出结果
+        """
+        if not jobs:
+            return []
+        if len(jobs) == 1:
+            return [self.export_image(*jobs[0])]
+        workers = min(self.EXPORT_MAX_WORKERS, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda job: self.export_image(*job), jobs))
+    
+    def apply_watermark_batch(self, jobs: List[Tuple[str, str]], config: "WatermarkConfig",
+                              format: str = 'PNG', quality: int = 95,
+                              processes: Optional[int] = None,
+                              on_done: Optional[Callable[[int, Optional[str]], None]] = None) -> List[bool]:
+        """
+        在多个进程中为一批图像添加水印并导出
+        
+        每个进程独立解码、合成与编码，不受GIL限制。字体在主进程中预先解析，
+        工作进程直接按路径加载而无需扫描系统字体；水印层在各进程内首张图片后即被缓存。
+        使用spawn方式启动进程，避免在含Qt线程的进程中fork。
+        
+        Args:
+            jobs: (原始图像路径, 输出路径) 列表
+            config: 水印配置
+            format: 输出格式 ('JPEG' 或 'PNG')
+            quality: JPEG质量 (1-100)
+            processes: 进程数，默认为CPU核数且任务少于BATCH_MIN_PROCESS_JOBS时在当前进程内处理；
+                为1或只有一项任务时在当前进程内处理
+            on_done: 每完成一项任务即在调用线程中回调(任务索引, 错误信息或None)，可用于汇报进度
+            
+        Returns:
+            List[bool]: 与jobs一一对应的处理结果
+        """
+        if not jobs:
+            return []
+        # 在副本上解析字体，不修改调用方（可能属于其他线程）持有的配置
+        config = replace(config)
+        if config.watermark_type == "text" and config.text:
+            self._resolve_config_font(config)
+        
+        if processes is None and len(jobs) < self.BATCH_MIN_PROCESS_JOBS:
+            processes = 1
+        processes = max(1, min(processes or os.cpu_count() or 1, len(jobs)))
+        results = [False] * len(jobs)
+        if processes == 1:
+            # 单进程时省去启动工作进程的开销
+            completed = ((i, _watermark_file(self, config, format, quality, *job))
+                         for i, job in enumerate(jobs))
+            for i, error in completed:
+                results[i] = error is None
+                if on_done is not None:
+                    on_done(i, error)
+            return results
+
+        # 仅批量导出用到，延迟导入以免拖慢启动
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        # 工作进程异常退出时，as_completed会抛出BrokenProcessPool而不是一直等待
+        with ProcessPoolExecutor(max_workers=processes,
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_batch_worker,
+                                 initargs=(config.to_dict(), format, quality)) as executor:
+            futures = [executor.submit(_watermark_one, item) for item in enumerate(jobs)]
+            for future in as_completed(futures):
+                i, error = future.result()
+                results[i] = error is None
+                if on_done is not None:
+                    on_done(i, error)
+        return results
+    
+    @classmethod
+    def save_image(cls, image: Image.Image, output_path: str, format: str = 'PNG',
+                   quality: int = 95) -> None:
+        """
+        按导出格式使用统一的编码参数保存图像，失败时抛出异常
+        
+        Args:
+            image: 要保存的图像，JPEG需为RGB等不含透明度的模式
+            output_path: 输出路径
+            format: 输出格式 ('JPEG' 或 'PNG')
+            quality: JPEG质量 (1-100)
+        """
+        if format.upper() == 'JPEG':
+            image.save(output_path, format='JPEG', quality=quality, **cls.JPEG_SAVE_OPTIONS)
+        else:
+            image.save(output_path, format='PNG', **cls.PNG_SAVE_OPTIONS)
+
+    def resize_image(self, image: Image.Image, method: str, target_width: int,
+                     target_height: int, percentage: int, keep_aspect: bool,
+                     resample: Image.Resampling = Image.Resampling.LANCZOS) -> Image.Image:
+        """按照指定方式调整图像大小
+
+        默认使用LANCZOS保证导出质量；实时预览传入PREVIEW_RESAMPLE，速度快数倍且在屏幕上难以分辨。
+        """
+        try:
+            new_size = self.calculate_resize_size(image.size, method, target_width, target_height,
+                                                  percentage, keep_aspect)
+            if new_size == image.size:
+                return image
+
+            return image.resize(new_size, resample)
+        except Exception as e:
+            print(f"调整图像尺寸失败: {e}")
+            return image
+
+    @staticmethod
+    def calculate_resize_size(size: Tuple[int, int], method: str, target_width: int,
+                              target_height: int, percentage: int, keep_aspect: bool) -> Tuple[int, int]:
+        """计算按指定方式调整后的图像尺寸，不支持的方式返回原尺寸"""
+        current_width, current_height = size
+
+        if method == "percentage":
+            scale = max(1, percentage) / 100.0
+            new_width = max(1, int(current_width * scale))
+            new_height = max(1, int(current_height * scale))
+        elif method == "width":
+            new_width = max(1, target_width)
+            if keep_aspect:
+                ratio = new_width / current_width
+                new_height = max(1, int(current_height * ratio))
+            else:
+                new_height = max(1, target_height if target_height > 0 else current_height)
+        elif method == "height":
+            new_height = max(1, target_height)
+            if keep_aspect:
+                ratio = new_height / current_height
+                new_width = max(1, int(current_width * ratio))
+            else:
+                new_width = max(1, target_width if target_width > 0 else current_width)
+        else:
+            return (current_width, current_height)
+
+        return (new_width, new_height)
+    
+    @staticmethod
+    def _flatten_rgba(image: Image.Image,
+                      background_color: Tuple[int, int, int] = (255, 255, 255)) -> Image.Image:
+        """将RGBA图像合成到纯色背景上，返回RGB图像
+
+        直接以RGBA图像本身作为mask，由Pillow在C层读取alpha通道，
+        避免split()额外分配单独的alpha波段图像。
+        """
+        background = Image.new('RGB', image.size, background_color)
+        background.paste(image, mask=image)
+        return background
+
+    def pil_to_qpixmap(self, pil_image: Image.Image) -> "QPixmap":
         """
         将PIL图像转换为QPixmap
         
@@ -1048,32 +1851,18 @@ class ImageProcessor:
         Returns:
             QPixmap: Qt pixmap对象
         """
+        # Qt仅在GUI进程中需要，延迟导入使批量导出的工作进程无需加载PyQt5
+        from PyQt5.QtGui import QPixmap
+
         try:
-            # 确保图像是RGB模式
             if pil_image.mode == 'RGBA':
-                # 创建白色背景并合成RGBA图像
-                background = Image.new('RGB', pil_image.size, (255, 255, 255))
-                background.paste(pil_image, mask=pil_image.split()[-1])
-                pil_image = background
-            elif pil_image.mode != 'RGB':
-                pil_image = pil_image.convert('RGB')
-            
-            # 获取图像数据
-            width, height = pil_image.size
-            
-            # 使用正确的字节顺序和步长
-            rgb_image = pil_image.tobytes('raw', 'RGB')
-            bytes_per_line = width * 3  # RGB每像素3字节
-            
-            # 创建QImage，确保字节顺序正确
-            qimage = QImage(rgb_image, width, height, bytes_per_line, QImage.Format_RGB888)
-            
-            # 转换为QPixmap
-            if qimage.isNull():
-                print("警告: 创建的QImage为空")
-                return QPixmap()
-                
-            pixmap = QPixmap.fromImage(qimage)
+                # 由Qt合成到白色背景，省去PIL侧的整图拍平副本
+                pixmap = self._pil_rgba_to_qpixmap(pil_image)
+            else:
+                # 确保图像是RGB模式
+                if pil_image.mode != 'RGB':
+                    pil_image = pil_image.convert('RGB')
+                pixmap = self._pil_rgb_to_qpixmap(pil_image)
             if pixmap.isNull():
                 print("警告: 创建的QPixmap为空")
                 return QPixmap()
@@ -1086,6 +1875,37 @@ class ImageProcessor:
             traceback.print_exc()
             return QPixmap()
     
+    @staticmethod
+    def _pil_rgb_to_qpixmap(rgb_image: Image.Image) -> "QPixmap":
+        """将已是RGB模式的PIL图像直接转换为QPixmap，不做模式检查"""
+        from PyQt5.QtGui import QPixmap, QImage
+
+        width, height = rgb_image.size
+        # QPixmap.fromImage会复制像素，data只需在此期间保持存活
+        data = rgb_image.tobytes('raw', 'RGB')
+        qimage = QImage(data, width, height, width * 3, QImage.Format_RGB888)
+        return QPixmap.fromImage(qimage)
+    
+    @staticmethod
+    def _pil_rgba_to_qpixmap(rgba_image: Image.Image) -> "QPixmap":
+        """将RGBA模式的PIL图像合成到白色背景并转换为QPixmap
+        
+        直接在PIL像素缓冲上构造QImage，由QPainter完成混合，
+        结果写入Qt原生的RGB32格式，转换为QPixmap时无需再做格式转换。
+        """
+        from PyQt5.QtCore import Qt
+        from PyQt5.QtGui import QPixmap, QImage, QPainter
+
+        width, height = rgba_image.size
+        data = rgba_image.tobytes('raw', 'RGBA')
+        source = QImage(data, width, height, width * 4, QImage.Format_RGBA8888)
+        flattened = QImage(width, height, QImage.Format_RGB32)
+        flattened.fill(Qt.white)
+        painter = QPainter(flattened)
+        painter.drawImage(0, 0, source)
+        painter.end()
+        return QPixmap.fromImage(flattened)
+    
     def remove_image(self, file_path: str) -> bool:
         """
         移除图像
@@ -1098,6 +1918,10 @@ class ImageProcessor:
         """
         if file_path in self.images:
             del self.images[file_path]
+            self._image_dirs = None
+            with self._decoded_lock:
+                self._decoded_cache.pop(file_path, None)
+                self._decoded_refs.pop(file_path, None)
             if self.current_image_path == file_path:
                 # 设置新的当前图像
                 if self.images:
@@ -1110,4 +1934,42 @@ class ImageProcessor:
     def clear_images(self):
         """清空所有图像"""
         self.images.clear()
+        self._image_dirs = None
+        with self._decoded_lock:
+            self._decoded_cache.clear()
+            self._decoded_refs.clear()
         self.current_image_path = None
+
+
+# 批量处理工作进程的状态：(处理器, 水印配置, 输出格式, JPEG质量)
+_batch_state = None
+
+
+def _init_batch_worker(config_data: dict, format: str, quality: int) -> None:
+    """工作进程初始化：每个进程持有独立的处理器及其字体、水印层缓存"""
+    from .config_manager import WatermarkConfig
+
+    global _batch_state
+    _batch_state = (ImageProcessor(), WatermarkConfig.from_dict(config_data), format, quality)
+
+
+def _watermark_one(item: Tuple[int, Tuple[str, str]]) -> Tuple[int, Optional[str]]:
+    index, (source_path, output_path) = item
+    processor, config, format, quality = _batch_state
+    return index, _watermark_file(processor, config, format, quality, source_path, output_path)
+
+
+def _watermark_file(processor: ImageProcessor, config: "WatermarkConfig", format: str, quality: int,
+                    source_path: str, output_path: str) -> Optional[str]:
+    """从磁盘读取一张图片，添加水印后导出；成功返回None，失败返回错误信息"""
+    try:
+        with Image.open(source_path) as source:
+            image = ImageProcessor._to_working_mode(source)
+        result = processor.apply_watermark(image, config)
+        if format.upper() == 'JPEG' and result.mode == 'RGBA':
+            result = ImageProcessor._flatten_rgba(result)
+        ImageProcessor.save_image(result, output_path, format, quality)
+        return None
+    except Exception as e:
+        print(f"批量添加水印失败 {source_path}: {e}")
+        return str(e)
@@ -37,4 +37,9 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后的可执行文件中，批量处理的子进程需要由此进入；
+    # 未打包时freeze_support为空操作，无需在启动时导入multiprocessing
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()
     main()
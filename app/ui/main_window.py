@@ -3,7 +3,12 @@
 实现应用程序的主要用户界面和交互逻辑
 """
 
+import logging
 import os
+import stat
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
@@ -14,13 +19,17 @@ from PyQt5.QtWidgets import (
     QScrollArea, QButtonGroup, QRadioButton, QSpinBox, QFontComboBox,
     QColorDialog, QCheckBox, QTabWidget, QGraphicsDropShadowEffect
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QTimer, QRectF, QPointF
-from PyQt5.QtGui import QPixmap, QIcon, QFont, QPainter, QPen, QColor, QFontInfo
+from PyQt5.QtCore import Qt, QThread, QObject, QSignalBlocker, pyqtSignal, QSize, QTimer, QRectF, QPointF
+from PyQt5.QtGui import QPixmap, QIcon, QFont, QPainter, QPen, QColor, QFontInfo, QTransform
 
 from ..core.image_processor import ImageProcessor
 from ..core.config_manager import ConfigManager, WatermarkConfig
 
 
+# 调试信息默认不输出，不再在拖拽等高频事件中同步写stdout
+logger = logging.getLogger(__name__)
+
+
 class ImageListWidget(QListWidget):
     """自定义图像列表控件，支持拖拽"""
     
@@ -34,18 +43,10 @@ class ImageListWidget(QListWidget):
     def dragEnterEvent(self, event):
         """拖拽进入事件"""
         try:
-            if event.mimeData().hasUrls():
-                # 检查是否有有效的文件URL
-                urls = event.mimeData().urls()
-                valid_files = []
-                for url in urls:
-                    file_path = url.toLocalFile()
-                    if file_path and (os.path.isfile(file_path) or os.path.isdir(file_path)):
-                        valid_files.append(file_path)
-                
-                if valid_files:
-                    event.acceptProposedAction()
-                    return
+            # 只检查是否含本地文件URL，不访问文件系统；文件有效性在放下时由load_dropped_files判断
+            if event.mimeData().hasUrls() and any(url.isLocalFile() for url in event.mimeData().urls()):
+                event.acceptProposedAction()
+                return
             
             event.ignore()
         except Exception as e:
@@ -71,8 +72,9 @@ class ImageListWidget(QListWidget):
                 files = [url.toLocalFile() for url in urls if url.toLocalFile()]
                 
                 if files:
-                    print(f"收到拖拽文件: {files}")
-                    self.main_window.load_dropped_files(files)
+                    logger.debug("收到拖拽文件: %s", files)
+                    # 放下事件返回前拖拽源会一直等待，文件检查与导入推迟到事件循环中执行
+                    QTimer.singleShot(0, lambda: self.main_window.load_dropped_files(files))
                     event.acceptProposedAction()
                     return
             
@@ -82,7 +84,85 @@ class ImageListWidget(QListWidget):
             event.ignore()
 
 
-class DraggableWatermarkItem(QGraphicsTextItem):
+class _DragNotifier(QObject):
+    """为不继承QObject的图形项转发拖拽完成信号"""
+    released = pyqtSignal()
+
+
+class _BoundedDragMixin:
+    """水印项的拖拽范围限制：按图像边界与自身尺寸预先算好位置上下限，拖动时只做比较
+
+    拖动过程中不逐像素通知外部，仅在松开鼠标且位置确实改变时由drag_notifier发出released信号。
+    """
+    
+    _drag_limits = None
+    _press_pos = None
+    # 为True时下一次位置变化不做范围限制（用于程序设置初始位置）
+    _ignore_next_bound = False
+    
+    def _init_drag_notifier(self):
+        self.drag_notifier = _DragNotifier()
+    
+    def mousePressEvent(self, event):
+        self._press_pos = self.pos()
+        super().mousePressEvent(event)
+    
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        if self._press_pos is not None and self.pos() != self._press_pos:
+            self.drag_notifier.released.emit()
+        self._press_pos = None
+    
+    def set_image_bounds(self, bounds: QRectF):
+        """设置图像边界，限制水印移动范围"""
+        self.image_bounds = bounds
+        self._drag_limits = None
+    
+    def _invalidate_drag_limits(self):
+        """水印尺寸变化后，下次拖动时重新计算位置上下限"""
+        self._drag_limits = None
+    
+    def _compute_drag_limits(self):
+        """返回水印左上角位置的(min_x, max_x, min_y, max_y)，使其中心保持在图像范围内"""
+        bounds = self.image_bounds
+        item_rect = self.boundingRect()
+        half_w = item_rect.width() / 2
+        half_h = item_rect.height() / 2
+
+        left_limit = bounds.left() + half_w
+        right_limit = bounds.right() - half_w
+        top_limit = bounds.top() + half_h
+        bottom_limit = bounds.bottom() - half_h
+
+        if left_limit > right_limit:
+            left_limit = right_limit = (bounds.left() + bounds.right()) / 2
+        if top_limit > bottom_limit:
+            top_limit = bottom_limit = (bounds.top() + bounds.bottom()) / 2
+
+        self._drag_limits = (left_limit - half_w, right_limit - half_w,
+                             top_limit - half_h, bottom_limit - half_h)
+        return self._drag_limits
+    
+    def _clamp_to_bounds(self, new_pos: QPointF) -> QPointF:
+        """将新位置限制在图像范围内（原地修改并返回new_pos）"""
+        if self._ignore_next_bound:
+            self._ignore_next_bound = False
+            return new_pos
+        min_x, max_x, min_y, max_y = self._drag_limits or self._compute_drag_limits()
+        x = new_pos.x()
+        if x < min_x:
+            new_pos.setX(min_x)
+        elif x > max_x:
+            new_pos.setX(max_x)
+        y = new_pos.y()
+        if y < min_y:
+            new_pos.setY(min_y)
+        elif y > max_y:
+            new_pos.setY(max_y)
+        return new_pos
+
+
+class DraggableWatermarkItem(_BoundedDragMixin, QGraphicsTextItem):
     """可拖拽的水印文本项"""
     
     def __init__(self, text="", parent=None):
@@ -100,49 +180,26 @@ class DraggableWatermarkItem(QGraphicsTextItem):
         
         # 水印边界
         self.image_bounds = QRectF()
-        
-    def set_image_bounds(self, bounds: QRectF):
-        """设置图像边界，限制水印移动范围"""
-        self.image_bounds = bounds
+        self._init_drag_notifier()
+    
+    def setFont(self, font: QFont):
+        super().setFont(font)
+        self._invalidate_drag_limits()
+    
+    def setPlainText(self, text: str):
+        super().setPlainText(text)
+        self._invalidate_drag_limits()
         
     def itemChange(self, change, value):
         """项目变化时的处理"""
         if change == QGraphicsItem.ItemPositionChange and self.image_bounds.isValid():
             # 限制水印在图像范围内移动
-            new_pos = value
-            item_rect = self.boundingRect()
-            half_w = item_rect.width() / 2
-            half_h = item_rect.height() / 2
-
-            center_x = new_pos.x() + half_w
-            center_y = new_pos.y() + half_h
-
-            left_limit = self.image_bounds.left() + half_w
-            right_limit = self.image_bounds.right() - half_w
-            top_limit = self.image_bounds.top() + half_h
-            bottom_limit = self.image_bounds.bottom() - half_h
-
-            if left_limit > right_limit:
-                left_limit = right_limit = (self.image_bounds.left() + self.image_bounds.right()) / 2
-            if top_limit > bottom_limit:
-                top_limit = bottom_limit = (self.image_bounds.top() + self.image_bounds.bottom()) / 2
-
-            if center_x < left_limit:
-                new_pos.setX(left_limit - half_w)
-            elif center_x > right_limit:
-                new_pos.setX(right_limit - half_w)
-
-            if center_y < top_limit:
-                new_pos.setY(top_limit - half_h)
-            elif center_y > bottom_limit:
-                new_pos.setY(bottom_limit - half_h)
-                
-            return new_pos
+            return self._clamp_to_bounds(value)
             
         return super().itemChange(change, value)
 
 
-class DraggablePixmapItem(QGraphicsPixmapItem):
+class DraggablePixmapItem(_BoundedDragMixin, QGraphicsPixmapItem):
     """可拖拽的水印图片项"""
 
     def __init__(self, pixmap=None, parent=None):
@@ -151,41 +208,15 @@ class DraggablePixmapItem(QGraphicsPixmapItem):
         self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
         self.image_bounds = QRectF()
+        self._init_drag_notifier()
 
-    def set_image_bounds(self, bounds: QRectF):
-        self.image_bounds = bounds
+    def setPixmap(self, pixmap: QPixmap):
+        super().setPixmap(pixmap)
+        self._invalidate_drag_limits()
 
     def itemChange(self, change, value):
         if change == QGraphicsItem.ItemPositionChange and self.image_bounds.isValid():
-            new_pos = value
-            item_rect = self.boundingRect()
-            half_w = item_rect.width() / 2
-            half_h = item_rect.height() / 2
-
-            center_x = new_pos.x() + half_w
-            center_y = new_pos.y() + half_h
-
-            left_limit = self.image_bounds.left() + half_w
-            right_limit = self.image_bounds.right() - half_w
-            top_limit = self.image_bounds.top() + half_h
-            bottom_limit = self.image_bounds.bottom() - half_h
-
-            if left_limit > right_limit:
-                left_limit = right_limit = (self.image_bounds.left() + self.image_bounds.right()) / 2
-            if top_limit > bottom_limit:
-                top_limit = bottom_limit = (self.image_bounds.top() + self.image_bounds.bottom()) / 2
-
-            if center_x < left_limit:
-                new_pos.setX(left_limit - half_w)
-            elif center_x > right_limit:
-                new_pos.setX(right_limit - half_w)
-
-            if center_y < top_limit:
-                new_pos.setY(top_limit - half_h)
-            elif center_y > bottom_limit:
-                new_pos.setY(bottom_limit - half_h)
-
-            return new_pos
+            return self._clamp_to_bounds(value)
 
         return super().itemChange(change, value)
 
@@ -199,6 +230,8 @@ class PreviewGraphicsView(QGraphicsView):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.scene = QGraphicsScene()
+        # 场景中最多只有图像与水印两项，BSP索引在每次拖动时的维护开销得不偿失
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         self.setScene(self.scene)
         self.setRenderHint(QPainter.Antialiasing)
         self.setDragMode(QGraphicsView.NoDrag)  # 禁用默认拖拽，使用自定义拖拽
@@ -209,21 +242,66 @@ class PreviewGraphicsView(QGraphicsView):
         
         # 图像原始尺寸（用于位置计算）
         self.original_image_size = (0, 0)
-        self._suspend_position_emission = False
+        # 图像项在场景中的矩形及场景坐标到原始图像坐标的缩放比例，每次set_image时计算一次
+        self._image_rect = QRectF()
+        self._image_scale = (1.0, 1.0)
+        
+    def set_image(self, pixmap: QPixmap, image_size: tuple = None):
+        """设置要显示的图像
+
+        图像项在多次预览之间复用，只替换其像素，不再清空并重建整个场景；
+        旧的水印项仍会移除，由调用方按需重新添加。
+
+        Args:
+            pixmap: 底图，可以是缩小后的图像
+            image_size: 图像的实际尺寸，默认为底图尺寸；底图较小时图像项被放大到该尺寸，
+                场景坐标始终与实际图像像素一致
+        """
+        if not pixmap or pixmap.isNull():
+            self.clear()
+            return
+        if image_size is None:
+            image_size = (pixmap.width(), pixmap.height())
+        image_size = tuple(image_size)
         
-    def set_image(self, pixmap: QPixmap):
-        """设置要显示的图像"""
-        self.scene.clear()
-        self.image_item = None  # 清空引用
-        self.watermark_item = None
+        if self.watermark_item:
+            self.scene.removeItem(self.watermark_item)
+            self.watermark_item = None
         
-        if pixmap and not pixmap.isNull():
+        if self.image_item is None:
             self.image_item = QGraphicsPixmapItem(pixmap)
+            # 按设备分辨率缓存缩放后的底图，拖动水印重绘时直接贴图，无需每帧重新缩放整幅原图
+            self.image_item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+            self.image_item.setTransformationMode(Qt.SmoothTransformation)
             self.scene.addItem(self.image_item)
-            self.fitInView(self.image_item, Qt.KeepAspectRatio)
-            
-            # 记录原始图像尺寸
-            self.original_image_size = (pixmap.width(), pixmap.height())
+        elif (self.image_item.pixmap().cacheKey() == pixmap.cacheKey()
+              and self.original_image_size == image_size):
+            # 底图未变（只改了水印），保留图像项及其设备缓存
+            return
+        else:
+            self.image_item.setPixmap(pixmap)
+        self.image_item.setTransform(QTransform.fromScale(image_size[0] / pixmap.width(),
+                                                          image_size[1] / pixmap.height()))
+        # 固定场景范围为图像区域，水印移动时Qt无需重新计算场景边界
+        self.scene.setSceneRect(self.image_item.sceneBoundingRect())
+        self.fitInView(self.image_item, Qt.KeepAspectRatio)
+        
+        # 记录原始图像尺寸
+        self.original_image_size = image_size
+        self._image_rect = image_rect = self.image_item.sceneBoundingRect()
+        self._image_scale = (
+            self.original_image_size[0] / image_rect.width(),
+            self.original_image_size[1] / image_rect.height()
+        )
+    
+    def clear(self):
+        """移除图像与水印；已为空时直接返回"""
+        if self.watermark_item:
+            self.scene.removeItem(self.watermark_item)
+            self.watermark_item = None
+        if self.image_item:
+            self.scene.removeItem(self.image_item)
+            self.image_item = None
     
     def add_watermark_preview(self, text: str = None, font: QFont = None,
                               color: QColor = None, opacity: int = 180,
@@ -238,8 +316,7 @@ class PreviewGraphicsView(QGraphicsView):
             self.scene.removeItem(self.watermark_item)
             self.watermark_item = None
 
-        image_rect = self.image_item.boundingRect()
-        self._suspend_position_emission = True
+        image_rect = self._image_rect
 
         if pixmap is not None:
             self.watermark_item = DraggablePixmapItem(pixmap)
@@ -260,11 +337,9 @@ class PreviewGraphicsView(QGraphicsView):
 
         # 计算期望中心点
         if position:
-            scale_x = image_rect.width() / self.original_image_size[0]
-            scale_y = image_rect.height() / self.original_image_size[1]
             desired_center = QPointF(
-                image_rect.left() + position[0] * scale_x,
-                image_rect.top() + position[1] * scale_y
+                image_rect.left() + position[0] / self._image_scale[0],
+                image_rect.top() + position[1] / self._image_scale[1]
             )
         else:
             desired_center = image_rect.center()
@@ -273,8 +348,12 @@ class PreviewGraphicsView(QGraphicsView):
         bounds = self.watermark_item.boundingRect()
         center_local = bounds.center()
         self.watermark_item.setTransformOriginPoint(center_local)
-        setattr(self.watermark_item, "_ignore_next_bound", True)
+        self.watermark_item._ignore_next_bound = True
         self.watermark_item.setRotation(-rotation)
+        # 未旋转时按设备分辨率缓存水印，拖动只平移缓存；旋转后的设备变换每次移动都会使缓存失效，
+        # 缓存反而增加一次离屏绘制，因此不启用
+        if rotation % 360 == 0:
+            self.watermark_item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
         self.watermark_item.setPos(
             desired_center.x() - center_local.x(),
             desired_center.y() - center_local.y()
@@ -288,65 +367,27 @@ class PreviewGraphicsView(QGraphicsView):
 
         # 添加到场景
         self.scene.addItem(self.watermark_item)
-
-        original_item_change = self.watermark_item.itemChange
-
-        def handler(change, value, original_handler=original_item_change):
-            return self._on_watermark_position_change(change, value, original_handler)
-
-        self.watermark_item.itemChange = handler
-        QTimer.singleShot(0, self._resume_position_emission)
-        
-    def _on_watermark_position_change(self, change, value, original_handler):
-        """水印位置变化处理"""
-        if change == QGraphicsItem.ItemPositionChange and getattr(self.watermark_item, "_ignore_next_bound", False):
-            setattr(self.watermark_item, "_ignore_next_bound", False)
-            return value
-
-        result = original_handler(change, value)
+        self.watermark_item.drag_notifier.released.connect(self._emit_watermark_position)
         
-        if change == QGraphicsItem.ItemPositionHasChanged and self.image_item:
-            if self._suspend_position_emission:
-                return result
-            # 将场景坐标转换回原始图像坐标
-            image_rect = self.image_item.boundingRect()
-            scene_rect = self.watermark_item.mapRectToScene(self.watermark_item.boundingRect())
-            center_scene = scene_rect.center()
-
-            relative_x = center_scene.x() - image_rect.left()
-            relative_y = center_scene.y() - image_rect.top()
-
-            scale_x = self.original_image_size[0] / image_rect.width()
-            scale_y = self.original_image_size[1] / image_rect.height()
-
-            original_x = int(round(relative_x * scale_x))
-            original_y = int(round(relative_y * scale_y))
-
-            # 发射位置变化信号
-            self.watermark_position_changed.emit((original_x, original_y))
-            
-        return result
-
-    def _resume_position_emission(self):
-        self._suspend_position_emission = False
+    def _emit_watermark_position(self):
+        """用户拖动水印结束后发射其在原始图像中的位置"""
+        position = self.get_watermark_position()
+        if position is not None:
+            self.watermark_position_changed.emit(position)
     
     def get_watermark_position(self):
         """获取当前水印在原始图像中的位置"""
         if not self.watermark_item or not self.image_item:
             return None
             
-        image_rect = self.image_item.boundingRect()
         scene_rect = self.watermark_item.mapRectToScene(self.watermark_item.boundingRect())
         center_scene = scene_rect.center()
 
-        relative_x = center_scene.x() - image_rect.left()
-        relative_y = center_scene.y() - image_rect.top()
-
-        scale_x = self.original_image_size[0] / image_rect.width()
-        scale_y = self.original_image_size[1] / image_rect.height()
+        relative_x = center_scene.x() - self._image_rect.left()
+        relative_y = center_scene.y() - self._image_rect.top()
 
-        original_x = int(round(relative_x * scale_x))
-        original_y = int(round(relative_y * scale_y))
+        original_x = int(round(relative_x * self._image_scale[0]))
+        original_y = int(round(relative_y * self._image_scale[1]))
 
         return (original_x, original_y)
     
@@ -354,12 +395,8 @@ class PreviewGraphicsView(QGraphicsView):
         """窗口大小改变时重新调整图像"""
         super().resizeEvent(event)
         if self.image_item and self.image_item.scene():
+            # 只改变视图变换，场景坐标不变，水印边界与坐标换算无需重新计算
             self.fitInView(self.image_item, Qt.KeepAspectRatio)
-            
-            # 重新调整水印边界
-            if self.watermark_item:
-                image_rect = self.image_item.boundingRect()
-                self.watermark_item.set_image_bounds(image_rect)
 
 
 class ExportThread(QThread):
@@ -376,68 +413,90 @@ class ExportThread(QThread):
         self.config = config
         
     def run(self):
-        """执行导出"""
-        success_count = 0
+        """执行导出：各图片在独立进程中并行解码、添加水印与编码"""
         total_count = len(self.file_paths)
-        
-        for i, file_path in enumerate(self.file_paths):
-            try:
-                # 生成输出文件名
-                base_name = os.path.splitext(os.path.basename(file_path))[0]
-                
-                if self.config.filename_rule == "prefix":
-                    output_name = f"{self.config.filename_prefix}{base_name}"
-                elif self.config.filename_rule == "suffix":
-                    output_name = f"{base_name}{self.config.filename_suffix}"
-                else:  # original
-                    output_name = base_name
-                
-                # 添加扩展名
-                if self.config.output_format.upper() == "JPEG":
-                    output_name += ".jpg"
-                else:
-                    output_name += ".png"
-                
-                output_path = os.path.join(self.output_folder, output_name)
-                
-                # 创建带水印的图像（包含尺寸调整）
-                source_image = self.processor.images.get(file_path)
-                if source_image is None:
-                    raise ValueError("源图像不可用")
-
-                watermarked_image = self.processor.apply_watermark(
-                    source_image,
-                    self.config
-                )
-
-                # 保存图像
-                if self.config.output_format.upper() == "JPEG":
-                    image_to_save = watermarked_image
-                    if image_to_save.mode != 'RGB':
-                        image_to_save = image_to_save.convert('RGB')
-                    image_to_save.save(
-                        output_path,
-                        format="JPEG",
-                        quality=self.config.jpeg_quality
-                    )
-                else:
-                    watermarked_image.save(output_path, format="PNG")
-                
-                success_count += 1
-                
-            except Exception as e:
-                self.error.emit(f"导出 {os.path.basename(file_path)} 失败: {str(e)}")
-            
+        output_format = self.config.output_format.upper()
+        
+        # 命名规则与扩展名对所有文件相同，循环前确定一次
+        prefix = suffix = ""
+        if self.config.filename_rule == "prefix":
+            prefix = self.config.filename_prefix
+        elif self.config.filename_rule == "suffix":
+            suffix = self.config.filename_suffix
+        suffix += ".jpg" if output_format == "JPEG" else ".png"
+        
+        jobs = []
+        for file_path in self.file_paths:
+            base_name = os.path.splitext(os.path.basename(file_path))[0]
+            jobs.append((file_path, os.path.join(self.output_folder, f"{prefix}{base_name}{suffix}")))
+        
+        finished_indexes = set()
+        succeeded = 0
+        
+        def on_done(index, error):
+            nonlocal succeeded
+            finished_indexes.add(index)
+            if error is None:
+                succeeded += 1
+            else:
+                self.error.emit(f"导出 {os.path.basename(self.file_paths[index])} 失败: {error}")
             # 更新进度
-            progress = int((i + 1) * 100 / total_count)
-            self.progress.emit(progress)
+            self.progress.emit(int(len(finished_indexes) * 100 / total_count))
         
-        self.finished.emit(success_count, total_count)
+        try:
+            self.processor.apply_watermark_batch(
+                jobs,
+                self.config,
+                output_format,
+                self.config.jpeg_quality,
+                on_done=on_done
+            )
+        except Exception as e:
+            # 批量处理中途失败（如工作进程异常退出）时，已完成的文件仍计入成功数
+            self.error.emit(f"导出失败: {str(e)}")
+            for index, file_path in enumerate(self.file_paths):
+                if index not in finished_indexes:
+                    self.error.emit(f"导出 {os.path.basename(file_path)} 失败: 未处理")
+        
+        self.finished.emit(succeeded, total_count)
+
+
+class ThumbnailThread(QThread):
+    """缩略图生成线程：解码与缩放在工作线程中完成，每生成一张即通知GUI线程"""
+    thumbnail_ready = pyqtSignal(int, object, object)  # 列表序号, 缓存键, PIL缩略图
+    
+    def __init__(self, processor, jobs):
+        super().__init__()
+        self.processor = processor
+        self.jobs = jobs
+        self._cancelled = False
+    
+    def cancel(self):
+        """停止生成尚未开始的缩略图"""
+        self._cancelled = True
+    
+    def run(self):
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = {executor.submit(self.processor.render_thumbnail, key): (index, key)
+                       for index, key in self.jobs}
+            for future in as_completed(futures):
+                if self._cancelled:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    return
+                index, key = futures[future]
+                self.thumbnail_ready.emit(index, key, future.result())
 
 
 class MainWindow(QMainWindow):
     """主窗口类"""
     
+    # 连续调整参数时预览刷新的最小间隔（毫秒）
+    PREVIEW_THROTTLE_MS = 100
+    # 列表图标缓存上限
+    MAX_ICON_CACHE = 512
+    # 预览底图缓存上限，底图不超过屏幕尺寸
+    MAX_PREVIEW_PIXMAPS = 4
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Photo Watermark 2")
@@ -447,13 +506,25 @@ class MainWindow(QMainWindow):
         self.setAcceptDrops(True)
         
         # 初始化核心组件
-        self.image_processor = ImageProcessor()
         self.config_manager = ConfigManager()
+        self.image_processor = ImageProcessor(
+            thumbnail_cache_dir=os.path.join(self.config_manager.config_dir, "thumbs"),
+            font_index_cache=os.path.join(self.config_manager.config_dir, "font_index.json"))
         
         # 当前水印预览
         self.preview_timer = QTimer()
         self.preview_timer.setSingleShot(True)
         self.preview_timer.timeout.connect(self.update_preview)
+        # 上次完整渲染预览时的(图像, 配置)
+        self._last_preview = None
+        # 最近一次加载到界面的模板名
+        self._last_loaded_template = None
+        # 缩略图pixmap的cacheKey -> QIcon；图标内部缓存了按列表尺寸缩放的位图，重建列表时复用
+        self._icon_cache = OrderedDict()
+        # (id(图像), 尺寸调整参数, 底图尺寸) -> (图像弱引用, 预览底图)；只改水印时复用底图，免去整图转换
+        # 只持有弱引用，缓存不会让已被解码缓存淘汰的整幅图像继续驻留内存
+        self._preview_pixmaps = OrderedDict()
+        self.thumbnail_thread = None
         
         # 自定义位置跟踪
         self.custom_watermark_position = None
@@ -662,6 +733,9 @@ class MainWindow(QMainWindow):
         position_layout = QGridLayout(position_group)
 
         self.position_buttons = QButtonGroup()
+        # 位置值与按钮的双向映射，读写配置时直接查表，无需遍历按钮读取属性
+        self._pos_to_button = {}
+        self._button_to_pos = {}
         positions = [
             ("左上", "top-left", 0, 0),
             ("上中", "top-center", 0, 1),
@@ -678,6 +752,8 @@ class MainWindow(QMainWindow):
             btn = QRadioButton(text)
             btn.setProperty("position", value)
             self.position_buttons.addButton(btn)
+            self._pos_to_button[value] = btn
+            self._button_to_pos[btn] = value
             position_layout.addWidget(btn, row, col)
             if value == "bottom-right":
                 btn.setChecked(True)
@@ -889,8 +965,10 @@ class MainWindow(QMainWindow):
         format_layout.addWidget(self.format_combo)
         export_layout.addLayout(format_layout)
         
-        # JPEG质量
-        self.jpeg_quality_layout = QVBoxLayout()
+        # JPEG质量，放在同一容器中，切换格式时整体显示/隐藏
+        self.jpeg_quality_widget = QWidget()
+        self.jpeg_quality_layout = QVBoxLayout(self.jpeg_quality_widget)
+        self.jpeg_quality_layout.setContentsMargins(0, 0, 0, 0)
         self.jpeg_quality_layout.addWidget(QLabel("JPEG质量:"))
         self.jpeg_quality_slider = QSlider(Qt.Horizontal)
         self.jpeg_quality_slider.setRange(1, 100)
@@ -901,12 +979,8 @@ class MainWindow(QMainWindow):
         self.jpeg_quality_label.setAlignment(Qt.AlignCenter)
         self.jpeg_quality_layout.addWidget(self.jpeg_quality_label)
         
-        for i in range(self.jpeg_quality_layout.count()):
-            widget = self.jpeg_quality_layout.itemAt(i).widget()
-            if widget:
-                widget.hide()
-        
-        export_layout.addLayout(self.jpeg_quality_layout)
+        self.jpeg_quality_widget.hide()
+        export_layout.addWidget(self.jpeg_quality_widget)
         
         # 文件名规则
         filename_layout = QVBoxLayout()
@@ -1090,11 +1164,17 @@ class MainWindow(QMainWindow):
         image_files = []
         folders = []
         
+        supported = self.image_processor.SUPPORTED_INPUT_FORMATS
         for file_path in files:
-            if os.path.isfile(file_path):
-                if any(file_path.lower().endswith(fmt) for fmt in self.image_processor.SUPPORTED_INPUT_FORMATS):
+            # 一次stat同时判断文件与文件夹
+            try:
+                mode = os.stat(file_path).st_mode
+            except OSError:
+                continue
+            if stat.S_ISREG(mode):
+                if file_path.lower().endswith(supported):
                     image_files.append(file_path)
-            elif os.path.isdir(file_path):
+            elif stat.S_ISDIR(mode):
                 folders.append(file_path)
         
         # 加载图片文件
@@ -1126,17 +1206,21 @@ class MainWindow(QMainWindow):
     
     def update_image_list(self):
         """更新图像列表显示"""
+        self._stop_thumbnail_thread()
         self.image_list.clear()
         
-        for file_path in self.image_processor.get_image_list():
+        file_paths = self.image_processor.get_image_list()
+        # 先用已缓存的缩略图填充列表，其余在后台生成后逐个补上
+        thumbnails, pending = self.image_processor.split_cached_thumbnails(file_paths)
+        
+        for file_path, thumbnail in zip(file_paths, thumbnails):
             # 创建列表项
             item = QListWidgetItem()
             item.setData(Qt.UserRole, file_path)
             
             # 设置缩略图
-            thumbnail = self.image_processor.create_thumbnail(file_path)
             if thumbnail:
-                item.setIcon(QIcon(thumbnail))
+                item.setIcon(self._thumbnail_icon(thumbnail))
             
             # 设置文件名
             filename = os.path.basename(file_path)
@@ -1145,20 +1229,61 @@ class MainWindow(QMainWindow):
             
             self.image_list.addItem(item)
         
+        if pending:
+            self.thumbnail_thread = ThumbnailThread(self.image_processor, pending)
+            self.thumbnail_thread.thumbnail_ready.connect(self.on_thumbnail_ready)
+            self.thumbnail_thread.start()
+        
         # 如果有图像，选择第一个
         if self.image_list.count() > 0:
             self.image_list.setCurrentRow(0)
             self.on_image_selected(self.image_list.item(0))
             self.preview_hint.hide()
         else:
-            self.preview_view.set_image(QPixmap())
+            self.preview_view.clear()
             self.preview_hint.show()
     
+    def on_thumbnail_ready(self, index, key, image):
+        """后台缩略图生成完成，更新对应列表项图标"""
+        thread = self.thumbnail_thread
+        if thread is None or self.sender() is not thread:
+            return
+        pixmap = self.image_processor.finish_thumbnail(key, image)
+        item = self.image_list.item(index)
+        if pixmap is not None and item is not None:
+            item.setIcon(self._thumbnail_icon(pixmap))
+    
+    def _thumbnail_icon(self, pixmap: QPixmap) -> QIcon:
+        """获取缩略图对应的图标（LRU缓存）
+
+        缩略图缓存对同一文件（路径与修改时间不变）返回同一个QPixmap，
+        因此以其cacheKey为键即可，文件被修改后自然生成新的图标。
+        """
+        key = pixmap.cacheKey()
+        icon = self._icon_cache.get(key)
+        if icon is None:
+            icon = QIcon(pixmap)
+            self._icon_cache[key] = icon
+            while len(self._icon_cache) > self.MAX_ICON_CACHE:
+                self._icon_cache.popitem(last=False)
+        else:
+            self._icon_cache.move_to_end(key)
+        return icon
+    
+    def _stop_thumbnail_thread(self):
+        """取消仍在运行的缩略图线程，其后发出的结果不再应用到列表"""
+        thread = self.thumbnail_thread
+        self.thumbnail_thread = None
+        if thread is not None:
+            thread.cancel()
+            thread.wait()
+    
     def clear_images(self):
         """清空图像列表"""
+        self._stop_thumbnail_thread()
         self.image_processor.clear_images()
         self.image_list.clear()
-        self.preview_view.set_image(QPixmap())
+        self.preview_view.clear()
         self.preview_hint.show()
         self.statusBar().showMessage("已清空图像列表")
     
@@ -1171,9 +1296,10 @@ class MainWindow(QMainWindow):
     
     def on_watermark_changed(self):
         """水印设置改变事件"""
-        # 延迟更新预览以避免频繁刷新
-        self.preview_timer.stop()
-        self.preview_timer.start(300)  # 300ms 延迟
+        # 节流而非防抖：计时未结束时合并后续改动，拖动滑块期间预览仍按固定间隔刷新，
+        # 计时结束时update_preview读取的是最新设置
+        if not self.preview_timer.isActive():
+            self.preview_timer.start(self.PREVIEW_THROTTLE_MS)
     
     def on_opacity_changed(self):
         """透明度改变事件"""
@@ -1206,16 +1332,14 @@ class MainWindow(QMainWindow):
     def on_rotation_changed(self, value: int):
         self._update_rotation_label(value)
         if hasattr(self, "rotation_spin") and self.rotation_spin.value() != value:
-            self.rotation_spin.blockSignals(True)
-            self.rotation_spin.setValue(value)
-            self.rotation_spin.blockSignals(False)
+            with QSignalBlocker(self.rotation_spin):
+                self.rotation_spin.setValue(value)
         self.on_watermark_changed()
 
     def on_rotation_spin_changed(self, value: int):
         if self.rotation_slider.value() != value:
-            self.rotation_slider.blockSignals(True)
-            self.rotation_slider.setValue(value)
-            self.rotation_slider.blockSignals(False)
+            with QSignalBlocker(self.rotation_slider):
+                self.rotation_slider.setValue(value)
         self.on_rotation_changed(value)
 
     def on_watermark_tab_changed(self, index: int):
@@ -1248,7 +1372,7 @@ class MainWindow(QMainWindow):
 
     def on_position_button_clicked(self, button):
         """九宫格位置按钮点击事件"""
-        if button not in self.position_buttons.buttons():
+        if button not in self._button_to_pos:
             return
         self.use_custom_position = False
         self.custom_watermark_position = None
@@ -1258,13 +1382,7 @@ class MainWindow(QMainWindow):
         """格式改变事件"""
         format_text = self.format_combo.currentText()
         # 显示/隐藏JPEG质量设置
-        for i in range(self.jpeg_quality_layout.count()):
-            widget = self.jpeg_quality_layout.itemAt(i).widget()
-            if widget:
-                if format_text == "JPEG":
-                    widget.show()
-                else:
-                    widget.hide()
+        self.jpeg_quality_widget.setVisible(format_text == "JPEG")
     
     def on_jpeg_quality_changed(self):
         """JPEG质量改变事件"""
@@ -1300,15 +1418,29 @@ class MainWindow(QMainWindow):
             return
         if self._suppress_watermark_position_signal:
             return
+        # 水印已被拖离上次渲染的位置，之后即使配置回到原值也需重新渲染
+        self._last_preview = None
         # 更新自定义位置
         self.custom_watermark_position = position
         self.use_custom_position = True
         
         # 取消位置按钮的选择（因为现在是自定义位置）
-        for button in self.position_buttons.buttons():
-            button.setChecked(False)
+        self._clear_position_buttons()
         
-        print(f"水印位置已更新为: {position}")  # 调试信息
+        logger.debug("水印位置已更新为: %s", position)
+    
+    def _clear_position_buttons(self):
+        """取消九宫格位置按钮的选中状态
+
+        互斥按钮组不允许直接取消选中的按钮，逐个setChecked(False)不起作用；
+        临时关闭互斥后只需取消当前选中的那一个。
+        """
+        checked = self.position_buttons.checkedButton()
+        if checked is None:
+            return
+        self.position_buttons.setExclusive(False)
+        checked.setChecked(False)
+        self.position_buttons.setExclusive(True)
     
     def _clear_watermark_position_suppression(self):
         """在事件循环空闲时恢复位置同步"""
@@ -1317,18 +1449,6 @@ class MainWindow(QMainWindow):
     def _clear_pending_preset_position(self):
         self._pending_preset_position = False
 
-    def refresh_template_list(self):
-        """刷新模板列表"""
-        self.template_combo.clear()
-        template_names = self.config_manager.get_template_names()
-        if template_names:
-            self.template_combo.addItems(template_names)
-        
-        # 更新按钮状态
-        has_templates = len(template_names) > 0
-        self.load_template_btn.setEnabled(has_templates)
-        self.delete_template_btn.setEnabled(has_templates)
-    
     def load_template(self):
         """加载选中的模板（显式加载，带确认提示）"""
         template_name = self.template_combo.currentText()
@@ -1338,8 +1458,9 @@ class MainWindow(QMainWindow):
         
         # 显式加载时提供确认提示
         if self.config_manager.load_template(template_name):
+            self._last_loaded_template = template_name
             self.load_config_to_ui_silent()  # 静默加载，不触发预览更新
-            self.update_preview()
+            self.on_watermark_changed()
             self.statusBar().showMessage(f"已加载模板: {template_name}")
             QMessageBox.information(self, "成功", f"模板 '{template_name}' 已成功加载！")
         else:
@@ -1393,6 +1514,8 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.Yes:
             if self.config_manager.delete_template(template_name):
+                if template_name == self._last_loaded_template:
+                    self._last_loaded_template = None
                 self.refresh_template_list()
                 self.statusBar().showMessage(f"已删除模板: {template_name}")
                 QMessageBox.information(self, "成功", f"模板 '{template_name}' 删除成功！")
@@ -1409,10 +1532,11 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.Yes:
             self.config_manager.reset_to_default()
+            self._last_loaded_template = None
             self.use_custom_position = False
             self.custom_watermark_position = None
             self.load_config_to_ui_silent()
-            self.update_preview()
+            self.on_watermark_changed()
             self.statusBar().showMessage("已重置为默认设置")
             QMessageBox.information(self, "成功", "已重置为默认设置")
     
@@ -1422,9 +1546,7 @@ class MainWindow(QMainWindow):
         current_selection = self.template_combo.currentText()
         
         # 临时阻塞信号，避免在重新填充时触发模板加载
-        self.template_combo.blockSignals(True)
-        
-        try:
+        with QSignalBlocker(self.template_combo):
             # 清空并重新填充
             self.template_combo.clear()
             templates = self.config_manager.get_template_names()
@@ -1436,25 +1558,37 @@ class MainWindow(QMainWindow):
                     index = self.template_combo.findText(current_selection)
                     if index >= 0:
                         self.template_combo.setCurrentIndex(index)
-        finally:
-            # 恢复信号
-            self.template_combo.blockSignals(False)
         
-        # 手动触发模板选择变化事件，确保当前选择的模板被加载
-        self.on_template_selection_changed(self.template_combo.currentText())
+        # 选择发生变化时手动触发模板选择变化事件，确保新选中的模板被加载；
+        # 恢复了原有选择时模板无需重新加载，只同步按钮状态
+        new_selection = self.template_combo.currentText()
+        if new_selection != current_selection:
+            self.on_template_selection_changed(new_selection)
+        else:
+            self._update_template_buttons(new_selection)
     
-    def on_template_selection_changed(self, template_name):
-        """模板选择变化事件 - 自动加载选中的模板"""
-        # 更新按钮状态
+    def _update_template_buttons(self, template_name):
+        """按是否选中模板启用/禁用加载与删除按钮"""
         has_selection = bool(template_name)
         self.load_template_btn.setEnabled(has_selection)
         self.delete_template_btn.setEnabled(has_selection)
+    
+    def on_template_selection_changed(self, template_name):
+        """模板选择变化事件 - 自动加载选中的模板"""
+        # 更新按钮状态
+        self._update_template_buttons(template_name)
+        
+        # 重新填充列表后恢复同一选择时，模板已经加载过，无需再次加载和渲染
+        if template_name == self._last_loaded_template:
+            return
         
         # 自动加载选中的模板（如果有选择的话）
         if template_name and template_name.strip():
             if self.config_manager.load_template(template_name):
+                self._last_loaded_template = template_name
                 self.load_config_to_ui_silent()  # 静默加载，不触发预览更新
-                self.update_preview()
+                # 与参数调整共用节流计时器，快速切换模板时只渲染最终选中的模板
+                self.on_watermark_changed()
                 self.statusBar().showMessage(f"已自动加载模板: {template_name}")
             else:
                 self.statusBar().showMessage(f"加载模板失败: {template_name}")
@@ -1469,21 +1603,15 @@ class MainWindow(QMainWindow):
             return
 
         config = self.get_current_config()
-        display_image = current_image.copy()
-
-        if config.resize_enabled:
-            display_image = self.image_processor.resize_image(
-                display_image,
-                config.resize_method,
-                config.resize_width,
-                config.resize_height,
-                config.resize_percentage,
-                config.keep_aspect_ratio
-            )
-
-        image_size = display_image.size
-        base_pixmap = self.image_processor.pil_to_qpixmap(display_image)
-        self.preview_view.set_image(base_pixmap)
+        # 图像与配置都未变化且预览仍在显示时，无需重新渲染
+        last = self._last_preview
+        if (last is not None and last[0] is current_image and last[1] == config
+                and self.preview_view.image_item is not None):
+            return
+        self._last_preview = None
+        
+        image_size, base_pixmap = self._preview_base_pixmap(current_image, config)
+        self.preview_view.set_image(base_pixmap, image_size)
 
         watermark_size = (0, 0)
         text_font = None
@@ -1560,6 +1688,52 @@ class MainWindow(QMainWindow):
 
         if self._pending_preset_position:
             QTimer.singleShot(0, self._clear_pending_preset_position)
+        self._last_preview = (current_image, config)
+    
+    def _preview_base_pixmap(self, image, config: WatermarkConfig) -> tuple:
+        """获取预览底图及按尺寸设置调整后的图像尺寸
+
+        底图最多按屏幕像素大小生成（视图会把它缩放回图像尺寸显示），
+        大图不再整幅转换为QPixmap；同一图像与尺寸参数只转换一次。
+        """
+        image_size = image.size
+        resize_key = None
+        if config.resize_enabled:
+            resize_key = (config.resize_method, config.resize_width, config.resize_height,
+                          config.resize_percentage, config.keep_aspect_ratio)
+            image_size = self.image_processor.calculate_resize_size(image.size, *resize_key)
+        preview_size = self._fit_preview_size(image_size)
+        key = (id(image), resize_key, preview_size)
+        cached = self._preview_pixmaps.get(key)
+        # 同时比较图像对象本身，避免图像释放后id被复用
+        if cached is not None and cached[0]() is image:
+            self._preview_pixmaps.move_to_end(key)
+            return image_size, cached[1]
+        
+        # 尺寸调整与预览缩小合并为一次缩放；resize不修改输入，无需预先复制整图
+        display_image = image
+        if preview_size != image.size:
+            # reducing_gap先按整数倍盒式缩小再滤波，大幅缩小时比直接滤波快一倍以上
+            display_image = image.resize(preview_size, self.image_processor.PREVIEW_RESAMPLE,
+                                         reducing_gap=2.0)
+        pixmap = self.image_processor.pil_to_qpixmap(display_image)
+        if not pixmap.isNull():
+            self._preview_pixmaps[key] = (weakref.ref(image), pixmap)
+            while len(self._preview_pixmaps) > self.MAX_PREVIEW_PIXMAPS:
+                self._preview_pixmaps.popitem(last=False)
+        return image_size, pixmap
+    
+    def _fit_preview_size(self, image_size: tuple) -> tuple:
+        """将图像尺寸等比缩小到不超过预览所在屏幕的物理像素尺寸"""
+        screen = self.preview_view.screen() or QApplication.primaryScreen()
+        if screen is None:
+            return image_size
+        ratio = screen.devicePixelRatio()
+        limit = screen.size()
+        scale = min(1.0, limit.width() * ratio / image_size[0], limit.height() * ratio / image_size[1])
+        if scale >= 1.0:
+            return image_size
+        return (max(1, round(image_size[0] * scale)), max(1, round(image_size[1] * scale)))
     
     def _estimate_text_size(self, config: WatermarkConfig) -> tuple:
         return self.image_processor.measure_text(
@@ -1605,38 +1779,7 @@ class MainWindow(QMainWindow):
 
     def _calculate_default_watermark_position(self, image_size: tuple, watermark_size: tuple,
                                               position_type: str) -> tuple:
-        img_width, img_height = image_size
-        wm_width, wm_height = watermark_size
-        margin = 20
-
-        wm_width = min(wm_width, img_width)
-        wm_height = min(wm_height, img_height)
-
-        half_w = wm_width / 2
-        half_h = wm_height / 2
-
-        left_x = margin + half_w
-        right_x = max(margin + half_w, img_width - margin - half_w)
-        center_x = img_width / 2
-
-        top_y = margin + half_h
-        bottom_y = max(margin + half_h, img_height - margin - half_h)
-        center_y = img_height / 2
-
-        positions = {
-            'top-left': (left_x, top_y),
-            'top-center': (center_x, top_y),
-            'top-right': (right_x, top_y),
-            'middle-left': (left_x, center_y),
-            'center': (center_x, center_y),
-            'middle-right': (right_x, center_y),
-            'bottom-left': (left_x, bottom_y),
-            'bottom-center': (center_x, bottom_y),
-            'bottom-right': (right_x, bottom_y)
-        }
-
-        chosen = positions.get(position_type, positions['bottom-right'])
-        return int(round(chosen[0])), int(round(chosen[1]))
+        return self.image_processor._calculate_grid_position(image_size, watermark_size, position_type)
 
     def _apply_text_shadow_effect(self, config: WatermarkConfig) -> None:
         if not isinstance(self.preview_view.watermark_item, DraggableWatermarkItem):
@@ -1726,10 +1869,9 @@ class MainWindow(QMainWindow):
             config.custom_position = self.custom_watermark_position
         else:
             config.use_custom_position = False
-            for button in self.position_buttons.buttons():
-                if button.isChecked():
-                    config.position_type = button.property("position")
-                    break
+            checked = self.position_buttons.checkedButton()
+            if checked is not None:
+                config.position_type = self._button_to_pos[checked]
         
         # 导出设置
         config.output_format = self.format_combo.currentText()
@@ -1773,9 +1915,8 @@ class MainWindow(QMainWindow):
         
         # 设置水印配置
         self.current_watermark_type = config.watermark_type
-        self.watermark_tabs.blockSignals(True)
-        self.watermark_tabs.setCurrentIndex(0 if config.watermark_type == "text" else 1)
-        self.watermark_tabs.blockSignals(False)
+        with QSignalBlocker(self.watermark_tabs):
+            self.watermark_tabs.setCurrentIndex(0 if config.watermark_type == "text" else 1)
         self.watermark_text.setText(config.text)
         self.font_size_spin.setValue(config.font_size)
         font = QFont(config.font_family, config.font_size)
@@ -1819,10 +1960,9 @@ class MainWindow(QMainWindow):
         self._update_resize_controls()
         
         # 设置位置
-        for button in self.position_buttons.buttons():
-            if button.property("position") == config.position_type:
-                button.setChecked(True)
-                break
+        button = self._pos_to_button.get(config.position_type)
+        if button is not None:
+            button.setChecked(True)
         
         # 设置导出配置
         self.format_combo.setCurrentText(config.output_format)
@@ -1846,8 +1986,7 @@ class MainWindow(QMainWindow):
             self.use_custom_position = True
             self.custom_watermark_position = config.custom_position
             # 取消所有位置按钮的选择
-            for button in self.position_buttons.buttons():
-                button.setChecked(False)
+            self._clear_position_buttons()
         else:
             # 使用九宫格位置
             self.use_custom_position = False
@@ -1894,10 +2033,10 @@ class MainWindow(QMainWindow):
             self.filename_suffix,
             self.prefix_input,
             self.suffix_input
-        ]
+        ] + self.position_buttons.buttons()
 
-        for widget in widgets_to_block:
-            widget.blockSignals(True)
+        # QSignalBlocker释放时恢复各控件原有的阻塞状态
+        blockers = [QSignalBlocker(widget) for widget in widgets_to_block]
 
         try:
             self.current_watermark_type = config.watermark_type
@@ -1942,10 +2081,9 @@ class MainWindow(QMainWindow):
             self.keep_aspect_check.setChecked(config.keep_aspect_ratio)
             self._update_resize_controls()
 
-            for button in self.position_buttons.buttons():
-                button.blockSignals(True)
-                button.setChecked(button.property("position") == config.position_type)
-                button.blockSignals(False)
+            button = self._pos_to_button.get(config.position_type)
+            if button is not None:
+                button.setChecked(True)
 
             self.format_combo.setCurrentText(config.output_format)
             self.jpeg_quality_slider.setValue(config.jpeg_quality)
@@ -1969,10 +2107,7 @@ class MainWindow(QMainWindow):
             if config.use_custom_position and config.custom_position:
                 self.use_custom_position = True
                 self.custom_watermark_position = config.custom_position
-                for button in self.position_buttons.buttons():
-                    button.blockSignals(True)
-                    button.setChecked(False)
-                    button.blockSignals(False)
+                self._clear_position_buttons()
             else:
                 self.use_custom_position = False
                 self.custom_watermark_position = None
@@ -1983,8 +2118,8 @@ class MainWindow(QMainWindow):
             self.on_jpeg_quality_changed()
 
         finally:
-            for widget in widgets_to_block:
-                widget.blockSignals(False)
+            for blocker in blockers:
+                blocker.unblock()
     
     def export_images(self):
         """导出图像"""
@@ -2003,11 +2138,7 @@ class MainWindow(QMainWindow):
             return
         
         # 检查是否与源文件夹相同
-        image_folders = set()
-        for file_path in self.image_processor.get_image_list():
-            image_folders.add(os.path.dirname(file_path))
-        
-        if output_folder in image_folders:
+        if output_folder in self.image_processor.get_image_dirs():
             reply = QMessageBox.question(
                 self,
                 "确认",
@@ -2022,7 +2153,7 @@ class MainWindow(QMainWindow):
         
         # 获取当前配置并保存
         current_config = self.get_current_config()
-        self.config_manager.current_config = current_config
+        self.config_manager.set_config(current_config)
         self.config_manager.save_config()
         
         # 开始导出
@@ -2071,9 +2202,10 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """窗口关闭事件"""
+        self._stop_thumbnail_thread()
         # 保存当前配置
         current_config = self.get_current_config()
-        self.config_manager.current_config = current_config
+        self.config_manager.set_config(current_config)
         self.config_manager.save_config()
         
         event.accept()
@@ -2081,19 +2213,10 @@ class MainWindow(QMainWindow):
     def dragEnterEvent(self, event):
         """主窗口拖拽进入事件"""
         try:
-            if event.mimeData().hasUrls():
-                # 检查是否有有效的文件URL
-                urls = event.mimeData().urls()
-                valid_files = []
-                for url in urls:
-                    file_path = url.toLocalFile()
-                    if file_path and (os.path.isfile(file_path) or os.path.isdir(file_path)):
-                        valid_files.append(file_path)
-                
-                if valid_files:
-                    print(f"主窗口接受拖拽: {valid_files}")
-                    event.acceptProposedAction()
-                    return
+            # 只检查是否含本地文件URL，不访问文件系统；文件有效性在放下时由load_dropped_files判断
+            if event.mimeData().hasUrls() and any(url.isLocalFile() for url in event.mimeData().urls()):
+                event.acceptProposedAction()
+                return
             
             event.ignore()
         except Exception as e:
@@ -2119,8 +2242,8 @@ class MainWindow(QMainWindow):
                 files = [url.toLocalFile() for url in urls if url.toLocalFile()]
                 
                 if files:
-                    print(f"主窗口收到拖拽文件: {files}")
-                    self.load_dropped_files(files)
+                    logger.debug("主窗口收到拖拽文件: %s", files)
+                    QTimer.singleShot(0, lambda: self.load_dropped_files(files))
                     event.acceptProposedAction()
                     return
             
@@ -0,0 +1,69 @@
+import json
+
+from app.core.config_manager import ConfigManager, WatermarkConfig
+
+
+def test_recent_output_folder_persisted_with_config(tmp_path):
+    manager = ConfigManager(str(tmp_path))
+    manager.save_recent_output_folder("/some/output")
+
+    assert manager.get_recent_output_folder() == "/some/output"
+
+    manager.save_config()
+    with open(manager.config_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    assert data["recent_output_folder"] == "/some/output"
+
+    reloaded = ConfigManager(str(tmp_path))
+    assert reloaded.get_recent_output_folder() == "/some/output"
+
+
+def test_templates_cached_and_refreshed_on_external_edit(tmp_path):
+    manager = ConfigManager(str(tmp_path))
+    assert manager.save_template("first")
+    assert manager.get_template_names() == ["first"]
+
+    templates = manager.load_templates()
+    templates["unsaved"] = {}
+    assert manager.get_template_names() == ["first"]
+
+    with open(manager.templates_file, 'w', encoding='utf-8') as f:
+        json.dump({"external": {"text": "edited"}}, f)
+    manager._templates_mtime = None
+
+    assert manager.get_template_names() == ["external"]
+    assert manager.load_template("external")
+    assert manager.get_config().text == "edited"
+
+    assert manager.delete_template("external")
+    assert manager.get_template_names() == []
+
+
+def test_config_written_atomically_in_compact_form(tmp_path):
+    manager = ConfigManager(str(tmp_path))
+    manager.update_config(text="水印")
+    assert manager.save_config()
+
+    with open(manager.config_file, 'r', encoding='utf-8') as f:
+        raw = f.read()
+
+    assert "\n" not in raw
+    assert json.loads(raw)["watermark"]["text"] == "水印"
+    assert not (tmp_path / "config.json.tmp").exists()
+
+
+def test_defaults_not_written_until_config_changes(tmp_path):
+    manager = ConfigManager(str(tmp_path))
+    assert not (tmp_path / "config.json").exists()
+
+    assert manager.save_config()
+    assert not (tmp_path / "config.json").exists()
+
+    manager.set_config(WatermarkConfig())
+    assert manager.save_config()
+    assert not (tmp_path / "config.json").exists()
+
+    changed = WatermarkConfig(text="changed")
+    manager.set_config(changed)
+    assert manager.save_config()
+    assert ConfigManager(str(tmp_path)).get_config().text == "changed"
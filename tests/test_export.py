@@ -0,0 +1,119 @@
+import pytest
+from PIL import Image
+
+from app.core.image_processor import ImageProcessor
+
+
+@pytest.fixture
+def processor():
+    return ImageProcessor()
+
+
+@pytest.fixture
+def source_paths(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"src_{i}.png"
+        Image.new('RGBA', (30, 20), (0, 0, 255, 0 if i == 0 else 255)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+def test_export_image_flattens_transparency_for_jpeg(processor, source_paths, tmp_path):
+    assert processor.load_image(source_paths[0])
+    output_path = str(tmp_path / "out.jpg")
+
+    assert processor.export_image(source_paths[0], output_path, 'JPEG', 90)
+
+    with Image.open(output_path) as exported:
+        assert exported.format == 'JPEG'
+        assert exported.size == (30, 20)
+        assert all(channel > 240 for channel in exported.getpixel((15, 10)))
+
+
+def test_export_images_batch_reports_each_job(processor, source_paths, tmp_path):
+    for path in source_paths:
+        assert processor.load_image(path)
+
+    jobs = [(path, str(tmp_path / f"out_{i}.png"), 'PNG', 95) for i, path in enumerate(source_paths)]
+    jobs.append((str(tmp_path / "not_loaded.png"), str(tmp_path / "skip.png"), 'PNG', 95))
+
+    results = processor.export_images_batch(jobs)
+
+    assert results == [True, True, True, False]
+    for _, output_path, _, _ in jobs[:-1]:
+        with Image.open(output_path) as exported:
+            assert exported.size == (30, 20)
+
+
+def test_apply_watermark_batch_in_processes(processor, source_paths, tmp_path):
+    from app.core.config_manager import WatermarkConfig
+
+    config = WatermarkConfig(text="Batch", use_custom_position=True, custom_position=(15, 10))
+    jobs = [(path, str(tmp_path / f"wm_{i}.jpg")) for i, path in enumerate(source_paths)]
+    jobs.append((str(tmp_path / "missing.png"), str(tmp_path / "missing.jpg")))
+
+    results = processor.apply_watermark_batch(jobs, config, 'JPEG', 90, processes=2)
+
+    assert results == [True, True, True, False]
+    for _, output_path in jobs[:-1]:
+        with Image.open(output_path) as exported:
+            assert exported.format == 'JPEG'
+            assert exported.size == (30, 20)
+
+
+def test_apply_watermark_batch_reports_each_completion(processor, source_paths, tmp_path):
+    from app.core.config_manager import WatermarkConfig
+
+    config = WatermarkConfig(text="Inline")
+    jobs = [(source_paths[1], str(tmp_path / "ok.png")),
+            (str(tmp_path / "missing.png"), str(tmp_path / "missing_out.png"))]
+    completed = []
+
+    results = processor.apply_watermark_batch(jobs, config, 'PNG', processes=1,
+                                              on_done=lambda i, error: completed.append((i, error)))
+
+    assert results == [True, False]
+    assert completed[0] == (0, None)
+    assert completed[1][0] == 1 and completed[1][1]
+
+
+def test_apply_watermark_batch_small_batch_inline_without_mutating_config(processor, source_paths,
+                                                                          tmp_path, monkeypatch):
+    import concurrent.futures
+    from app.core.config_manager import WatermarkConfig
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("small batches should not start worker processes")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", no_pool)
+    config = WatermarkConfig(text="Small", font_path="")
+    jobs = [(path, str(tmp_path / f"small_{i}.png")) for i, path in enumerate(source_paths)]
+    assert len(jobs) < processor.BATCH_MIN_PROCESS_JOBS
+
+    assert processor.apply_watermark_batch(jobs, config, 'PNG') == [True] * len(jobs)
+    assert config.font_path == ""
+
+
+def test_export_thread_counts_successes_when_pool_breaks(processor, source_paths, tmp_path,
+                                                         monkeypatch, qapp):
+    from concurrent.futures.process import BrokenProcessPool
+    from app.core.config_manager import WatermarkConfig
+    from app.ui.main_window import ExportThread
+
+    def breaking_batch(jobs, config, format, quality, on_done=None):
+        on_done(0, None)
+        on_done(2, None)
+        raise BrokenProcessPool("worker died")
+
+    monkeypatch.setattr(processor, "apply_watermark_batch", breaking_batch)
+    thread = ExportThread(processor, source_paths, str(tmp_path), WatermarkConfig(text="Broken"))
+    finished, errors = [], []
+    thread.finished.connect(lambda succeeded, total: finished.append((succeeded, total)))
+    thread.error.connect(errors.append)
+
+    thread.run()
+
+    assert finished == [(2, 3)]
+    assert any("worker died" in message for message in errors)
+    assert any("src_1.png" in message for message in errors)
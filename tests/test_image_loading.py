@@ -0,0 +1,202 @@
+import os
+
+import pytest
+from PIL import Image
+
+from app.core.image_processor import ImageProcessor
+
+
+@pytest.fixture
+def processor():
+    return ImageProcessor()
+
+
+@pytest.fixture
+def image_folder(tmp_path):
+    Image.new('RGB', (40, 30), (255, 0, 0)).save(tmp_path / "a.jpg")
+    Image.new('RGBA', (20, 10), (0, 255, 0, 128)).save(tmp_path / "b.PNG")
+    (tmp_path / "notes.txt").write_text("not an image")
+    (tmp_path / "sub.png").mkdir()
+    return tmp_path
+
+
+def test_load_image_records_metadata_without_decoding(processor, image_folder):
+    path = str(image_folder / "a.jpg")
+
+    assert processor.load_image(path)
+
+    meta = processor.images[path]
+    assert meta.size == (40, 30)
+    assert meta.mode == 'RGB'
+    assert path not in processor._decoded_cache
+
+
+def test_get_image_decodes_on_demand_and_bounds_cache(processor, image_folder):
+    paths = []
+    for i in range(processor.MAX_DECODED_IMAGES + 2):
+        path = image_folder / f"img_{i}.png"
+        Image.new('RGB', (8, 8), (i, i, i)).save(path)
+        paths.append(str(path))
+        assert processor.load_image(str(path))
+
+    for path in paths:
+        image = processor.get_image(path)
+        assert image is not None
+        assert image.size == (8, 8)
+
+    assert len(processor._decoded_cache) == processor.MAX_DECODED_IMAGES
+    assert processor.get_image(str(image_folder / "missing.png")) is None
+
+
+def test_get_image_keeps_opaque_sources_in_rgb(processor, image_folder):
+    opaque, transparent = str(image_folder / "a.jpg"), str(image_folder / "b.PNG")
+    assert processor.load_image(opaque) and processor.load_image(transparent)
+
+    assert processor.get_image(opaque).mode == 'RGB'
+    assert processor.get_image(transparent).mode == 'RGBA'
+
+
+def test_load_images_from_folder_filters_supported_files(processor, image_folder):
+    count = processor.load_images_from_folder(str(image_folder))
+
+    assert count == 2
+    assert sorted(processor.get_image_list()) == sorted([
+        str(image_folder / "a.jpg"),
+        str(image_folder / "b.PNG"),
+    ])
+
+
+def test_create_thumbnails_batch_matches_input_order(processor, image_folder, qapp):
+    processor.load_images_from_folder(str(image_folder))
+    paths = processor.get_image_list() + [str(image_folder / "unknown.png")]
+
+    thumbnails = processor.create_thumbnails_batch(paths, (16, 16))
+
+    assert len(thumbnails) == len(paths)
+    assert thumbnails[-1] is None
+    for thumbnail in thumbnails[:-1]:
+        assert thumbnail is not None and not thumbnail.isNull()
+        assert max(thumbnail.width(), thumbnail.height()) <= 16
+
+
+def test_thumbnails_cached_in_memory_and_on_disk(image_folder, tmp_path, qapp):
+    cache_dir = tmp_path / "thumbs"
+    processor = ImageProcessor(thumbnail_cache_dir=str(cache_dir))
+    path = str(image_folder / "a.jpg")
+    assert processor.load_image(path)
+
+    first = processor.create_thumbnail(path, (16, 16))
+    assert first is not None and not first.isNull()
+    assert processor.create_thumbnail(path, (16, 16)) is first
+    assert len(list(cache_dir.glob("*.png"))) == 1
+
+    warm = ImageProcessor(thumbnail_cache_dir=str(cache_dir))
+    assert warm.load_image(path)
+    assert warm.create_thumbnails_batch([path], (16, 16))[0].size() == first.size()
+    assert len(list(cache_dir.glob("*.png"))) == 1
+
+
+def test_thumbnail_disk_cache_pruned_oldest_first(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "thumbs"
+    cache_dir.mkdir()
+    for i in range(4):
+        thumb = cache_dir / f"{i}.png"
+        thumb.write_bytes(b"\0" * 100)
+        os.utime(thumb, ns=(i * 10**9, i * 10**9))
+    monkeypatch.setattr(ImageProcessor, "MAX_THUMBNAIL_DISK_BYTES", 250)
+
+    ImageProcessor(thumbnail_cache_dir=str(cache_dir))
+
+    assert sorted(p.name for p in cache_dir.glob("*.png")) == ["2.png", "3.png"]
+
+
+def test_watermark_caches_bounded(processor, tmp_path):
+    paths = []
+    for i in range(processor.MAX_WATERMARK_CACHE + 2):
+        path = tmp_path / f"wm_{i}.png"
+        Image.new('RGBA', (4, 4), (i, 0, 0, 255)).save(path)
+        paths.append(str(path))
+        assert processor._watermark_entry(str(path)) is not None
+
+    assert list(processor._watermark_cache) == paths[-processor.MAX_WATERMARK_CACHE:]
+    for i in range(processor.MAX_PATH_STAT_CACHE + 5):
+        processor._path_mtime(str(tmp_path / f"missing_{i}.png"))
+    assert len(processor._path_stat_cache) == processor.MAX_PATH_STAT_CACHE
+
+
+def test_pil_to_qpixmap_flattens_rgba_onto_white(processor, qapp):
+    image = Image.new('RGBA', (6, 4), (200, 40, 0, 128))
+    expected = processor._flatten_rgba(image).getpixel((0, 0))
+
+    pixmap = processor.pil_to_qpixmap(image)
+
+    assert (pixmap.width(), pixmap.height()) == (6, 4)
+    color = pixmap.toImage().pixelColor(0, 0)
+    actual = (color.red(), color.green(), color.blue())
+    assert all(abs(a - e) <= 1 for a, e in zip(actual, expected))
+
+
+def test_thumbnail_flattens_after_shrinking(processor, image_folder, qapp):
+    path = str(image_folder / "b.PNG")
+    assert processor.load_image(path)
+    cached = processor.get_image(path)
+    original = cached.tobytes()
+
+    thumbnail = processor.create_thumbnail(path, (8, 8))
+
+    assert cached.tobytes() == original
+    assert (thumbnail.width(), thumbnail.height()) == (8, 4)
+    color = thumbnail.toImage().pixelColor(4, 2)
+    assert (color.red(), color.blue()) == (127, 127) and color.green() == 255
+
+
+def test_evicted_image_reused_while_still_referenced(processor, image_folder):
+    paths = []
+    for i in range(processor.MAX_DECODED_IMAGES + 1):
+        path = image_folder / f"ref_{i}.png"
+        Image.new('RGB', (4, 4), (i, 0, 0)).save(path)
+        paths.append(str(path))
+        assert processor.load_image(str(path))
+
+    held = processor.get_image(paths[0])
+    for path in paths[1:]:
+        processor.get_image(path)
+    assert paths[0] not in processor._decoded_cache
+
+    assert processor.get_image(paths[0]) is held
+
+
+def test_thumbnail_thread_renders_uncached_thumbnails(processor, image_folder, qapp):
+    from app.ui.main_window import ThumbnailThread
+
+    processor.load_images_from_folder(str(image_folder))
+    paths = processor.get_image_list()
+    cached, pending = processor.split_cached_thumbnails(paths)
+    assert cached == [None, None] and [i for i, _ in pending] == [0, 1]
+
+    ready = {}
+    thread = ThumbnailThread(processor, pending)
+    thread.thumbnail_ready.connect(
+        lambda index, key, image: ready.__setitem__(index, processor.finish_thumbnail(key, image)))
+    thread.run()
+
+    assert sorted(ready) == [0, 1]
+    cached, pending = processor.split_cached_thumbnails(paths)
+    assert pending == [] and [p.cacheKey() for p in cached] == [ready[0].cacheKey(), ready[1].cacheKey()]
+
+
+def test_image_dirs_follow_loaded_images(processor, image_folder, tmp_path):
+    other = tmp_path / "other"
+    other.mkdir()
+    Image.new('RGB', (4, 4)).save(other / "c.png")
+
+    processor.load_images_from_folder(str(image_folder))
+    assert processor.get_image_dirs() == {str(image_folder)}
+
+    assert processor.load_image(str(other / "c.png"))
+    assert processor.get_image_dirs() == {str(image_folder), str(other)}
+
+    processor.remove_image(str(other / "c.png"))
+    assert processor.get_image_dirs() == {str(image_folder)}
+    processor.clear_images()
+    assert processor.get_image_dirs() == set()
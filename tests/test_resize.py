@@ -97,7 +97,7 @@ def test_apply_watermark_with_rotation_shadow_stroke(processor, base_image):
     result = processor.apply_watermark(base_image, config)
 
     assert result.size == base_image.size
-    assert result.mode == 'RGBA'
+    assert result.mode == base_image.mode
 
 
 def test_rotated_text_near_edge_not_truncated(processor, base_image):
@@ -157,8 +157,151 @@ def test_image_watermark_rotation_matches_preview_direction(processor, base_imag
         overlay.alpha_composite(rotated, dest=config.custom_position)
         expected = Image.alpha_composite(base_rgba, overlay)
 
-        diff = ImageChops.difference(result, expected)
+        assert result.mode == base_image.mode
+        diff = ImageChops.difference(result.convert('RGBA'), expected)
         assert diff.getbbox() is None
     finally:
         if os.path.exists(watermark_path):
-            os.remove(watermark_path)
\ No newline at end of file
+            os.remove(watermark_path)
+
+
+def test_apply_watermark_leaves_source_untouched(processor, base_image):
+    original = base_image.tobytes()
+
+    result = processor.apply_watermark(base_image, make_config(text="Copy"))
+    empty = processor.apply_watermark(base_image, make_config(text=""))
+
+    assert result is not base_image and empty is not base_image
+    assert base_image.tobytes() == original
+    assert result.tobytes() != original
+
+
+def test_image_watermark_leaves_source_untouched(processor, base_image, tmp_path):
+    watermark_path = str(tmp_path / "wm.png")
+    Image.new('RGBA', (10, 6), (0, 0, 255, 255)).save(watermark_path)
+    original = base_image.tobytes()
+
+    for resize_enabled in (False, True):
+        config = make_config(watermark_type="image", image_watermark_path=watermark_path,
+                             image_opacity=255, resize_enabled=resize_enabled,
+                             resize_method="percentage", resize_percentage=50)
+        result = processor.apply_watermark(base_image, config)
+        assert result is not base_image
+        assert result.tobytes() != base_image.resize(result.size).tobytes()
+
+    assert base_image.tobytes() == original
+
+
+def test_image_watermark_prepared_once_per_settings(processor, base_image, tmp_path, monkeypatch):
+    watermark_path = str(tmp_path / "wm.png")
+    Image.new('RGBA', (10, 6), (0, 0, 255, 200)).save(watermark_path)
+    config = make_config(watermark_type="image", image_watermark_path=watermark_path, rotation_angle=30)
+
+    first = processor.apply_watermark(base_image, config)
+
+    def fail(*_args):
+        raise AssertionError("watermark prepared again")
+
+    monkeypatch.setattr(processor, "_render_image_watermark", fail)
+    second = processor.apply_watermark(base_image, config)
+
+    assert second.tobytes() == first.tobytes()
+
+
+def test_image_watermark_resize_reused_across_opacity(processor, base_image, tmp_path, monkeypatch):
+    watermark_path = str(tmp_path / "wm.png")
+    Image.new('RGBA', (40, 20), (0, 0, 255, 255)).save(watermark_path)
+    resizes = []
+    original_resize = Image.Image.resize
+
+    def counting_resize(self, size, *args, **kwargs):
+        if self.mode == 'RGBA':
+            resizes.append(size)
+        return original_resize(self, size, *args, **kwargs)
+
+    monkeypatch.setattr(Image.Image, "resize", counting_resize)
+
+    for opacity in (255, 128, 64):
+        config = make_config(watermark_type="image", image_watermark_path=watermark_path,
+                             image_scale=0.5, image_opacity=opacity, rotation_angle=15)
+        processor.apply_watermark(base_image, config)
+
+    assert resizes.count((20, 10)) == 1
+
+
+def test_image_watermark_reloaded_after_file_change(processor, base_image, tmp_path):
+    watermark_path = tmp_path / "wm.png"
+    Image.new('RGBA', (10, 6), (0, 0, 255, 255)).save(watermark_path)
+    config = make_config(watermark_type="image", image_watermark_path=str(watermark_path),
+                         image_opacity=255, use_custom_position=True, custom_position=(50, 50))
+
+    assert processor.apply_watermark(base_image, config).getpixel((50, 50)) == (0, 0, 255)
+
+    Image.new('RGBA', (10, 6), (0, 255, 0, 255)).save(watermark_path)
+    os.utime(watermark_path, ns=(1, 1))
+    processor._path_stat_cache.clear()
+
+    assert processor.apply_watermark(base_image, config).getpixel((50, 50)) == (0, 255, 0)
+
+
+def test_right_angle_bounds_match_pillow_rotation(processor):
+    for rotation in (90, 180, 270, -90, 450):
+        expected = Image.new('RGBA', (31, 17)).rotate(rotation, expand=True).size
+        assert processor._rotated_bounds(31, 17, rotation) == expected
+
+
+def test_resize_image_uses_requested_resample(processor, monkeypatch):
+    image = Image.new('RGB', (40, 20))
+    filters = []
+    original_resize = Image.Image.resize
+
+    def recording_resize(self, size, resample=None, *args, **kwargs):
+        filters.append(resample)
+        return original_resize(self, size, resample, *args, **kwargs)
+
+    monkeypatch.setattr(Image.Image, "resize", recording_resize)
+
+    processor.resize_image(image, "percentage", 0, 0, 50, True)
+    processor.resize_image(image, "percentage", 0, 0, 50, True, resample=processor.PREVIEW_RESAMPLE)
+
+    assert filters == [Image.Resampling.LANCZOS, Image.Resampling.BILINEAR]
+
+
+def test_calculate_resize_size_matches_resize_image(processor):
+    image = Image.new('RGB', (40, 20))
+    for args in (("percentage", 0, 0, 50, True), ("width", 30, 0, 100, True),
+                 ("height", 0, 5, 100, False), ("none", 0, 0, 100, True)):
+        expected = processor.resize_image(image, *args).size
+        assert processor.calculate_resize_size(image.size, *args) == expected
+
+
+def test_composite_overlay_clips_at_edges_for_rgb_and_rgba(processor):
+    overlay = Image.new('RGBA', (20, 12), (255, 0, 0, 160))
+    for position in ((0, 0), (99, 5), (50, 99), (-9, -5)):
+        rgb = Image.new('RGB', (100, 100), (0, 0, 255))
+        rgba = Image.new('RGBA', (100, 100), (0, 0, 255, 255))
+
+        processor._composite_overlay(rgb, overlay, position)
+        processor._composite_overlay(rgba, overlay, position)
+
+        diff = ImageChops.difference(rgb, rgba.convert('RGB'))
+        assert max(high for _, high in diff.getextrema()) <= 1
+
+
+def test_right_angle_overlay_rotation_is_exact(processor):
+    overlay = Image.effect_noise((31, 17), 60).convert('RGBA')
+
+    assert processor._rotate_overlay(overlay, 360) is overlay
+    for rotation in (90, 180, 270, -90):
+        rotated = processor._rotate_overlay(overlay, rotation)
+        expected = overlay.rotate(rotation, resample=Image.BICUBIC, expand=True)
+        assert rotated.size == expected.size
+        assert rotated.tobytes() == expected.tobytes()
+
+
+def test_unscaled_image_watermark_shares_source(processor):
+    watermark = Image.new('RGBA', (10, 6), (0, 0, 255, 255))
+
+    assert processor._render_image_watermark("wm.png", 1, watermark, 1.0, 255, 0) is watermark
+    faded = processor._render_image_watermark("wm.png", 1, watermark, 1.0, 128, 0)
+    assert faded is not watermark and watermark.getpixel((0, 0))[3] == 255
@@ -32,3 +32,119 @@ def test_preview_rotation_matches_export(angle, qapp):
     assert center is not None
     assert abs(center[0] - 400) <= 1
     assert abs(center[1] - 300) <= 1
+
+
+def test_set_image_reuses_image_item(qapp):
+    view = PreviewGraphicsView()
+    first = QPixmap(200, 100)
+    first.fill(Qt.white)
+    view.set_image(first)
+    image_item = view.image_item
+    view.add_watermark_preview(text="Reuse", font=QFont("Arial", 12), position=(100, 50))
+
+    second = QPixmap(300, 150)
+    second.fill(Qt.black)
+    view.set_image(second)
+
+    assert view.image_item is image_item
+    assert view.watermark_item is None
+    assert view.scene.items() == [image_item]
+    assert view.original_image_size == (300, 150)
+
+    view.set_image(QPixmap())
+    assert view.image_item is None and view.scene.items() == []
+
+
+def test_watermark_drag_clamped_after_font_change(qapp):
+    from PyQt5.QtCore import QRectF
+    from app.ui.main_window import DraggableWatermarkItem
+
+    item = DraggableWatermarkItem("Clamp")
+    item.set_image_bounds(QRectF(0, 0, 400, 300))
+    item.setPos(-1000, -1000)
+    assert (item.x(), item.y()) == (0, 0)
+
+    item.setFont(QFont("Arial", 8))
+    item.setPos(1000, 1000)
+    rect = item.boundingRect()
+    assert item.x() == 400 - rect.width()
+    assert item.y() == 300 - rect.height()
+
+
+def test_watermark_position_emitted_once_per_drag(qapp):
+    from PyQt5.QtCore import QPointF
+
+    view = PreviewGraphicsView()
+    pixmap = QPixmap(400, 300)
+    pixmap.fill(Qt.white)
+    view.set_image(pixmap)
+    view.add_watermark_preview(text="Drag", font=QFont("Arial", 12), position=(200, 150))
+    received = []
+    view.watermark_position_changed.connect(received.append)
+
+    item = view.watermark_item
+    for step in range(1, 6):
+        item.setPos(item.pos() + QPointF(step, 0))
+    assert received == []
+
+    item.drag_notifier.released.emit()
+    assert received == [view.get_watermark_position()]
+
+
+def test_unrotated_watermark_cached_at_device_resolution(qapp):
+    from PyQt5.QtWidgets import QGraphicsItem
+
+    view = PreviewGraphicsView()
+    pixmap = QPixmap(400, 300)
+    pixmap.fill(Qt.white)
+    view.set_image(pixmap)
+
+    view.add_watermark_preview(text="Cached", font=QFont("Arial", 24), position=(200, 150))
+    assert view.watermark_item.cacheMode() == QGraphicsItem.DeviceCoordinateCache
+
+    view.add_watermark_preview(text="Rotated", font=QFont("Arial", 24), position=(200, 150), rotation=30)
+    assert view.watermark_item.cacheMode() == QGraphicsItem.NoCache
+
+
+def test_clear_removes_image_and_watermark(qapp):
+    view = PreviewGraphicsView()
+    pixmap = QPixmap(200, 100)
+    pixmap.fill(Qt.white)
+    view.set_image(pixmap)
+    view.add_watermark_preview(text="Clear", font=QFont("Arial", 12), position=(100, 50))
+
+    view.clear()
+    assert view.image_item is None and view.watermark_item is None
+    assert view.scene.items() == []
+    view.clear()
+    assert view.scene.items() == []
+
+
+def test_set_image_same_pixmap_keeps_item_and_drops_watermark(qapp):
+    view = PreviewGraphicsView()
+    pixmap = QPixmap(200, 100)
+    pixmap.fill(Qt.white)
+    view.set_image(pixmap)
+    image_item = view.image_item
+    view.add_watermark_preview(text="Same", font=QFont("Arial", 12), position=(100, 50))
+
+    view.set_image(pixmap)
+
+    assert view.image_item is image_item
+    assert view.image_item.pixmap().cacheKey() == pixmap.cacheKey()
+    assert view.watermark_item is None and view.scene.items() == [image_item]
+
+
+def test_downscaled_pixmap_keeps_image_coordinates(qapp):
+    view = PreviewGraphicsView()
+    pixmap = QPixmap(300, 200)
+    pixmap.fill(Qt.white)
+    view.set_image(pixmap, (1200, 800))
+
+    assert view.original_image_size == (1200, 800)
+    assert view.scene.sceneRect().size().toSize().width() == 1200
+    assert view._image_scale == (1.0, 1.0)
+
+    view.add_watermark_preview(text="Scaled", font=QFont("Arial", 24), position=(600, 400))
+    x, y = view.get_watermark_position()
+    assert abs(x - 600) <= 1 and abs(y - 400) <= 1
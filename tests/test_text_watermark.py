@@ -170,3 +170,199 @@ def test_custom_position_uses_center(processor):
 
     assert abs(center_x - config.custom_position[0]) <= 2
     assert abs(center_y - config.custom_position[1]) <= 2
+
+
+def test_load_font_is_cached(processor):
+    first = processor._load_font("Arial", 24, True, False)
+    second = processor._load_font("Arial", 24, True, False)
+    other_size = processor._load_font("Arial", 30, True, False)
+
+    assert first is second
+    assert other_size is not first
+
+
+def test_fonts_cached_per_thread(processor):
+    import threading
+
+    main_font = processor._load_font("Arial", 24, False, False)
+    worker_fonts = []
+
+    def worker():
+        worker_fonts.append(processor._load_font("Arial", 24, False, False))
+        worker_fonts.append(processor._load_font("Arial", 24, False, False))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert worker_fonts[0] is worker_fonts[1]
+    assert processor._load_font("Arial", 24, False, False) is main_font
+    for i in range(processor.MAX_TRUETYPE_CACHE + 1):
+        processor._load_font("Arial", 10 + i, False, False)
+    assert len(processor._thread_font_caches()[0]) == processor.MAX_TRUETYPE_CACHE
+
+
+def test_text_layer_reused_across_images(processor):
+    font = processor._load_font("Arial", 24, True, False)
+    args = (font, "Layer", (255, 255, 255), True, (2, 2), 1, (0, 0, 0))
+
+    first = processor._render_text_layer(*args)
+    assert processor._render_text_layer(*args) is first
+    assert processor._render_text_layer(font, "Other", *args[2:]) is not first
+
+    for i in range(processor.MAX_TEXT_LAYER_CACHE + 1):
+        processor._render_text_layer(font, f"text {i}", *args[2:])
+    assert len(processor._text_layer_cache) == processor.MAX_TEXT_LAYER_CACHE
+
+
+def test_opacity_change_reuses_rendered_text_layer(processor, monkeypatch):
+    base = Image.new('RGB', (200, 100), (0, 0, 0))
+    calls = []
+    original = processor._render_text_layer_uncached
+
+    def counting(*args):
+        calls.append(args)
+        return original(*args)
+
+    monkeypatch.setattr(processor, "_render_text_layer_uncached", counting)
+
+    opaque = processor.add_text_watermark(base, "Fade", (100, 50), opacity=255, font_size=30, color=(255, 255, 255))
+    faded = processor.add_text_watermark(base, "Fade", (100, 50), opacity=128, font_size=30, color=(255, 255, 255))
+
+    assert len(calls) == 1
+    peak = opaque.getchannel('R').getextrema()[1]
+    assert peak > 200
+    assert abs(faded.getchannel('R').getextrema()[1] - peak * 128 / 255) <= 3
+
+
+def test_truetype_shared_between_font_requests(processor, monkeypatch):
+    from PIL import ImageFont
+    from app.core import image_processor as module
+
+    calls = []
+    default_font = ImageFont.load_default()
+
+    def fake_truetype(path, size, index=0):
+        calls.append((path, size, index))
+        return default_font
+
+    monkeypatch.setattr(module.ImageFont, "truetype", fake_truetype)
+
+    first = processor._load_font("Family A", 20, False, False, "/fonts/a.ttf", 0)
+    second = processor._load_font("Family B", 20, False, False, "/fonts/a.ttf", 0)
+    processor._get_font_name("/fonts/a.ttf", 0)
+    processor._get_font_name("/fonts/a.ttf", 0)
+
+    assert first is second
+    assert calls.count(("/fonts/a.ttf", 20, 0)) == 1
+    assert calls.count(("/fonts/a.ttf", 32, 0)) == 1
+
+
+def test_font_index_loaded_from_disk_cache(tmp_path, monkeypatch):
+    from app.core.image_processor import FontEntry, FontResolver
+
+    font_dir = tmp_path / "fonts"
+    font_dir.mkdir()
+    (font_dir / "demo.ttf").write_bytes(b"")
+    cache_path = str(tmp_path / "font_index.json")
+    monkeypatch.setattr(FontResolver, "_font_directories", lambda self: [str(font_dir)])
+
+    def fake_index(self, path, index, seen_entries):
+        self._store_entry("Demo Sans", FontEntry(path=path, style="Bold", index=index))
+
+    monkeypatch.setattr(FontResolver, "_index_font_file", fake_index)
+    expected = (str(font_dir / "demo.ttf"), 0)
+    assert FontResolver(cache_path).resolve("Demo Sans", True, False) == expected
+
+    def fail_index(self, path, index, seen_entries):
+        raise AssertionError("font directory rescanned")
+
+    monkeypatch.setattr(FontResolver, "_index_font_file", fail_index)
+    assert FontResolver(cache_path).resolve("DemoSans", True, False) == expected
+
+    (font_dir / "new.ttf").write_bytes(b"")
+    with pytest.raises(AssertionError):
+        FontResolver(cache_path).resolve("Demo Sans", True, False)
+
+
+def test_measure_text_cached_per_parameters(processor, monkeypatch):
+    args = ("Cached", "Arial", 24, True, False, True, 2, True, (3, 3), 30)
+    first = processor._measure_text(*args)
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("measurement not cached")
+
+    monkeypatch.setattr(processor, "_measure_text_uncached", fail)
+    assert processor._measure_text(*args) == first
+    with pytest.raises(AssertionError):
+        processor._measure_text("Other", *args[1:])
+
+
+def test_font_entry_style_flags_drive_resolution():
+    from app.core.image_processor import FontEntry, FontResolver
+
+    regular = FontEntry(path="/fonts/a.ttf", style="Regular")
+    bold_italic = FontEntry(path="/fonts/a.ttc", style="Bold Oblique", index=2)
+
+    assert not regular.has_bold and not regular.has_italic
+    assert bold_italic.has_bold and bold_italic.has_italic
+    assert bold_italic == FontEntry(path="/fonts/a.ttc", style="Bold Oblique", index=2)
+
+    resolver = FontResolver()
+    resolver._indexed = True
+    resolver._store_entry("Demo", regular)
+    resolver._store_entry("Demo", bold_italic)
+    assert resolver.resolve("demo", True, True) == ("/fonts/a.ttc", 2)
+    assert resolver.resolve("Demo", False, False) == ("/fonts/a.ttf", 0)
+
+
+def test_collection_indexed_by_header_face_count(tmp_path, monkeypatch):
+    import struct
+    from app.core.image_processor import FontResolver
+
+    collection = tmp_path / "demo.ttc"
+    collection.write_bytes(b"ttcf" + struct.pack(">HHI", 1, 0, 3) + b"\0" * 16)
+    indexed = []
+    monkeypatch.setattr(FontResolver, "_index_font_file",
+                        lambda self, path, index, seen: indexed.append(index))
+
+    FontResolver()._index_collection(str(collection), set())
+
+    assert indexed == [0, 1, 2]
+    assert FontResolver._collection_face_count(str(tmp_path / "missing.ttc")) == 0
+
+
+def test_collection_face_count_clamped_and_stops_at_unreadable_face(tmp_path):
+    import struct
+    from app.core.image_processor import FontResolver
+
+    collection = tmp_path / "bogus.ttc"
+    collection.write_bytes(b"ttcf" + struct.pack(">HHI", 1, 0, 0xFFFFFFFF) + b"\0" * 16)
+    assert FontResolver._collection_face_count(str(collection)) == FontResolver.MAX_COLLECTION_FACES
+
+    attempted = []
+    resolver = FontResolver()
+    original = resolver._index_font_file
+
+    def tracking(path, index, seen):
+        attempted.append(index)
+        return original(path, index, seen)
+
+    resolver._index_font_file = tracking
+    resolver._index_collection(str(collection), set())
+    assert attempted == [0]
+
+
+def test_font_index_walks_nested_directories(tmp_path, monkeypatch):
+    from app.core.image_processor import FontResolver
+
+    (tmp_path / "truetype" / "dejavu").mkdir(parents=True)
+    (tmp_path / "truetype" / "dejavu" / "DejaVuSans.TTF").write_bytes(b"")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "skip.ttf").write_bytes(b"")
+    (tmp_path / "readme.txt").write_text("not a font")
+
+    directories, font_files = FontResolver()._walk_font_files([str(tmp_path)])
+
+    assert font_files == [str(tmp_path / "truetype" / "dejavu" / "DejaVuSans.TTF")]
+    assert str(tmp_path / ".hidden") not in directories